@@ -1,13 +1,33 @@
 from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+import hashlib
+import itertools
 import json
 import os
 import random
+import threading
 from pathlib import Path
-from gtts import gTTS
 import io
 from datetime import timedelta
+from urllib.parse import quote
 from dotenv import load_dotenv
+from progress_store import ProgressStore
+from user_db import SQLiteUserStore
+from file_cache import MtimeCache
+from attempt_log import AttemptLog
+from audio_cache import AudioCache, audio_key
+from audio_formats import MIMETYPES, TranscodeError, negotiate, transcode
+from tts import get_synthesizer
+from corpus import CorpusRegistry
+from groups import ids_digest
+from session_db import SQLiteSessionStore
+from session_store import SessionStore, StudySession
+from session_token import TokenSessionStore
+from payload_cache import PayloadCache
+from search_index import SearchIndex
+from single_flight import SingleFlight, SingleFlightTimeout
+from user_decks import DeckStore, PersonalCorpora
 
 load_dotenv()
 
@@ -29,12 +49,16 @@ app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=30)  # 30일간 로그
 
 # 사용자 파일 경로
 USERS_FILE = os.path.join(os.path.dirname(__file__), 'users.json')
+USER_DB_FILE = os.path.join(os.path.dirname(__file__), 'users.db')
 
-def load_users():
+# 사용자 저장소 종류: 'json' (users.json, 기본) 또는 'sqlite' (users.db)
+USER_BACKEND = os.getenv('USER_BACKEND', 'json')
+
+def read_users_file(path):
     """JSON 파일에서 사용자 목록 로드"""
-    if os.path.exists(USERS_FILE):
+    if os.path.exists(path):
         try:
-            with open(USERS_FILE, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 # 기존 단순 구조를 새 구조로 변환
                 if data and isinstance(list(data.values())[0], str):
@@ -111,48 +135,70 @@ def load_users():
     save_users(default_users)
     return default_users
 
+# users.json 캐시 (파일의 mtime/크기가 바뀔 때만 다시 읽음)
+# 파일이 외부에서 수정되면 메모리의 진행 상황도 다시 읽도록 함
+users_cache = MtimeCache(USERS_FILE, read_users_file,
+                         on_reload=lambda: progress_store.invalidate())
+
+def load_users():
+    """사용자 목록 반환 (읽기 전용으로 사용, 변경 시 save_users 호출)"""
+    return users_cache.get()
+
 def save_users(users):
     """사용자 목록을 JSON 파일에 저장"""
-    with open(USERS_FILE, 'w', encoding='utf-8') as f:
+    tmp_file = USERS_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
         json.dump(users, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, USERS_FILE)
+    users_cache.set(users)
 
-def get_user_progress(username, mode='Words'):
-    """사용자의 진행 상황 가져오기"""
-    users = load_users()
-    if username in users:
-        return users[username].get('progress', {}).get(mode, {
-            'category': '전체', 
-            'completed_count': 0, 
-            'current_group_index': 0,
-            'review_mode': False,
-            'review_start_group': 0,
-            'last_study_date': None
-        })
-    return {
-        'category': '전체', 
-        'completed_count': 0, 
-        'current_group_index': 0,
-        'review_mode': False,
-        'review_start_group': 0,
-        'last_study_date': None
-    }
+def save_progress_records(records):
+    """변경된 (사용자, 모드)의 진행 상황만 users.json에 반영 (한 번에 저장)"""
+    # 캐시된 dict를 직접 바꾸지 않도록 변경되는 사용자만 복사
+    users = dict(load_users())
+    for username, modes in records.items():
+        if username in users and isinstance(users[username], dict):
+            progress = dict(users[username].get('progress', {}), **modes)
+            users[username] = dict(users[username], progress=progress)
+    save_users(users)
 
-def save_user_progress(username, mode, progress_data):
-    """사용자의 진행 상황 저장"""
-    from datetime import datetime
+# 진행 상황 write-behind 저장소 (5초마다 또는 20명 이상 변경 시 저장)
+PROGRESS_FLUSH_INTERVAL = 5.0
+PROGRESS_MAX_DIRTY = 20
+if USER_BACKEND == 'sqlite':
+    user_db = SQLiteUserStore(USER_DB_FILE)
+    if user_db.user_count() == 0:
+        # 처음 한 번 users.json 가져오기 (기존 형식도 변환)
+        user_db.import_users(load_users())
+    progress_store = ProgressStore(None, user_db.save_progress_records,
+                                   flush_interval=PROGRESS_FLUSH_INTERVAL,
+                                   max_dirty=PROGRESS_MAX_DIRTY,
+                                   load_mode_fn=user_db.get_mode_progress)
+else:
+    user_db = None
+    progress_store = ProgressStore(load_users, save_progress_records,
+                                   flush_interval=PROGRESS_FLUSH_INTERVAL,
+                                   max_dirty=PROGRESS_MAX_DIRTY)
+
+def get_user_password(username):
+    """로그인용 비밀번호 조회 (없는 사용자면 None)"""
+    if user_db is not None:
+        return user_db.get_password(username)
+    # 캐시된 사용자 목록에서 조회 (파일이 바뀐 경우에만 다시 로드)
     users = load_users()
-    if username in users:
-        if 'progress' not in users[username]:
-            users[username]['progress'] = {}
-        if mode not in users[username]['progress']:
-            users[username]['progress'][mode] = {}
-        
-        users[username]['progress'][mode].update(progress_data)
-        users[username]['progress'][mode]['last_study_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        save_users(users)
+    if username not in users:
+        return None
+    user_data = users[username]
+    # 새 구조와 기존 구조 모두 지원
+    return user_data.get('password', user_data) if isinstance(user_data, dict) else user_data
+
+def get_user_progress(username, mode='Words'):
+    """사용자의 진행 상황 가져오기 (메모리에서 조회)"""
+    return progress_store.get(username, mode)
 
-# 앱 시작시 사용자 목록 로드
-USERS = load_users()
+def save_user_progress(username, mode, progress_data):
+    """사용자의 진행 상황 저장 (변경분은 모아서 주기적으로 파일에 기록)"""
+    progress_store.update(username, mode, progress_data)
 
 def login_required(f):
     @wraps(f)
@@ -169,77 +215,195 @@ ED_WORDS_FILE = os.path.join(DATA_DIR, 'english_words_ed.json')
 YB_WORDS_FILE = os.path.join(DATA_DIR, 'english_words_yb_con.json')
 NUMBERS_DATES_FILE = os.path.join(DATA_DIR, 'numbers_dates.json')
 
-# 세션 데이터 저장소 (실제로는 데이터베이스 사용 권장)
-sessions = {}
+# 실행 중 생성되는 데이터(로그, 캐시 등) 경로
+INSTANCE_DIR = app.instance_path
+os.makedirs(INSTANCE_DIR, exist_ok=True)
 
-def load_words():
-    """JSON에서 단어 로드"""
-    if os.path.exists(WORDS_FILE):
-        try:
-            with open(WORDS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return [{"word": "Apple", "meaning": "사과", "example": "I ate an apple.", "category": "기초"}]
-
-def create_word_groups(words, group_size=3):
-    """단어를 group_size개씩 묶음으로 만들고 번호 부여"""
-    # 단어를 랜덤하게 섞기 (시드 고정으로 항상 같은 순서)
-    import random
-    random.seed(42)  # 고정된 시드로 항상 같은 순서로 섞임
-    shuffled_words = words.copy()
-    random.shuffle(shuffled_words)
-    
-    groups = []
-    for i in range(0, len(shuffled_words), group_size):
-        group_number = (i // group_size) + 1
-        group_words = shuffled_words[i:i + group_size]
-        # 나머지 단어도 포함 (최소 1개 이상이면 묶음에 추가)
-        if len(group_words) >= 1:
-            groups.append({
-                'group_number': group_number,
-                'words': group_words
-            })
-    return groups
-
-def load_ed_words():
-    """JSON에서 ed (Past Tense) 단어 로드"""
-    if os.path.exists(ED_WORDS_FILE):
-        try:
-            with open(ED_WORDS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return []
+# 모드별 단어 목록은 한 번만 읽고, 파일이 바뀌면 자동으로 다시 읽음
+# 묶음 배치는 instance/layouts 에 저장해 단어가 추가/삭제되어도 기존 묶음이 유지되도록 함
+# 단어 목록은 instance/corpus 의 바이너리 파일을 mmap 으로 열어 필요한 단어만 읽음
+# 단어 추가/삭제는 instance/journal 에 기록하고 CORPUS_COMPACT_INTERVAL 마다 JSON 파일에 합침
+CORPUS_COMPACT_INTERVAL = 5 * 60
+corpora = CorpusRegistry(layout_dir=os.path.join(INSTANCE_DIR, 'layouts'),
+                         binary_dir=os.path.join(INSTANCE_DIR, 'corpus'),
+                         journal_dir=os.path.join(INSTANCE_DIR, 'journal'),
+                         compact_interval=CORPUS_COMPACT_INTERVAL)
+corpora.register('Words', WORDS_FILE,
+                 default=[{"word": "Apple", "meaning": "사과", "example": "I ate an apple.", "category": "기초"}])
+corpora.register('ed', ED_WORDS_FILE)
+corpora.register('yb', YB_WORDS_FILE)
+corpora.register('numbers', NUMBERS_DATES_FILE)
+for _mode in corpora.names():
+    corpora.get(_mode)
 
-def load_yb_words():
-    """JSON에서 YB 영한사전 단어 로드"""
-    if os.path.exists(YB_WORDS_FILE):
-        try:
-            with open(YB_WORDS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"YB 단어 로드 오류: {e}")
-            pass
-    return []
+# 사용자별 개인 단어장 (instance/decks.db, 학습할 때 공유 코퍼스 위에 얹어서 사용)
+decks = PersonalCorpora(corpora, DeckStore(os.path.join(INSTANCE_DIR, 'decks.db')))
 
-def load_numbers_dates():
-    """JSON에서 숫자/날짜 단어 로드"""
-    numbers_file = os.path.join(DATA_DIR, 'numbers_dates.json')
-    if os.path.exists(numbers_file):
-        try:
-            with open(numbers_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"숫자/날짜 단어 로드 오류: {e}")
-            pass
-    return []
+# 답안 시도 로그 (버퍼링 후 백그라운드 기록, 1시간마다 단어별 집계로 압축)
+ATTEMPT_LOG_FILE = os.path.join(INSTANCE_DIR, 'attempts.ndjson')
+ATTEMPT_STATS_FILE = os.path.join(INSTANCE_DIR, 'attempt_stats.json')
+attempt_log = AttemptLog(ATTEMPT_LOG_FILE, stats_path=ATTEMPT_STATS_FILE, compact_interval=3600)
+
+# 세션 데이터 저장소 (2시간 사용하지 않으면 만료, 최대 5000개)
+# 'memory' 는 프로세스 안에만 두고, 'sqlite' 는 여러 워커가 instance/sessions.db 를 공유,
+# 'token' 은 서버에 저장하지 않고 서명된 토큰으로 클라이언트가 들고 다님
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'memory')
+SESSION_DB_FILE = os.path.join(INSTANCE_DIR, 'sessions.db')
+SESSION_TTL = 2 * 60 * 60
+SESSION_MAX_ENTRIES = 5000
+if SESSION_BACKEND == 'sqlite':
+    sessions = SQLiteSessionStore(SESSION_DB_FILE, ttl=SESSION_TTL, max_entries=SESSION_MAX_ENTRIES)
+elif SESSION_BACKEND == 'token':
+    sessions = TokenSessionStore(app.secret_key, ttl=SESSION_TTL,
+                                 user_fn=lambda: session.get('username'))
+    sessions.init_app(app)
+else:
+    sessions = SessionStore(ttl=SESSION_TTL, max_entries=SESSION_MAX_ENTRIES)
+
+# 묶음 단어 목록 JSON 캐시 ((모드, 코퍼스 버전, 묶음 번호)별, 최대 4MB)
+GROUP_PAYLOAD_CACHE_BYTES = 4 * 1024 * 1024
+group_payloads = PayloadCache(max_bytes=GROUP_PAYLOAD_CACHE_BYTES)
+
+# 카테고리 선택에서 필터 없음을 뜻하는 값
+ALL_CATEGORIES = '전체'
+
+# 읽기 전용 코퍼스 응답의 브라우저/프록시 캐시 시간 (지나면 ETag 로 재검증)
+CORPUS_CACHE_MAX_AGE = 300
+
+# /api/get-words 페이지 크기 (기본값, 최대값)
+GET_WORDS_PAGE_SIZE = 100
+GET_WORDS_MAX_PAGE_SIZE = 1000
+
+# /api/search 접두어 검색 색인 (모든 모드, 단어가 추가/삭제되면 바뀐 단어만 반영)
+SEARCH_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+search_index = SearchIndex(corpora)
+threading.Thread(target=search_index.warm, name='search-index-warm', daemon=True).start()
+
+# 발음 음성 디스크 캐시 (instance/audio, 최대 256MB, 같은 단어는 한 번만 합성)
+# 같은 주소의 음성은 바뀌지 않으므로 브라우저에도 오래 캐시하게 함
+AUDIO_CACHE_BYTES = 256 * 1024 * 1024
+AUDIO_MAX_AGE = 30 * 24 * 60 * 60
+audio_cache = AudioCache(os.path.join(INSTANCE_DIR, 'audio'), max_bytes=AUDIO_CACHE_BYTES)
+
+# 발음 합성기 ('gtts', 오프라인은 'espeak', 테스트는 'stub')
+# 미리 만들어 두려면: python pregen_audio.py --tts <같은 합성기>
+TTS_BACKEND = os.getenv('TTS_BACKEND', 'gtts')
+synthesizer = get_synthesizer(TTS_BACKEND)
+
+# 동시에 들어온 같은 음성 합성/AI 예문 요청은 한 번만 실행하고 결과를 함께 사용
+# (기다리는 요청은 음성 20초, AI 60초까지 기다림)
+audio_flights = SingleFlight(timeout=20)
+ai_flights = SingleFlight(timeout=60)
+
+# 발음 요청 텍스트 최대 길이 (예문까지)
+AUDIO_MAX_TEXT = 300
+
+# 묶음 음성 번들 (한 번에 최대 20개 단어, 캐시에 없는 음성은 4개씩 동시에 합성)
+AUDIO_BUNDLE_MAX_WORDS = 20
+audio_bundle_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='audio-bundle')
+
+def get_corpus(mode, username=None):
+    """모드 이름으로 코퍼스 스냅샷 가져오기 (알 수 없는 모드는 Words, username 을 주면 개인 단어장 포함)"""
+    if mode not in corpora.names():
+        mode = 'Words'
+    if username:
+        return decks.get(username, mode)
+    return corpora.get(mode)
+
+def resolve_words(corpus, word_ids):
+    """단어 ID 목록을 응답용 단어 목록으로 변환 (세션에서 다시 찾을 수 있도록 id 포함)"""
+    return [dict(corpus.words[i], id=i) for i in word_ids]
+
+def group_words_json(corpus, word_groups, group_index):
+    """묶음 단어 목록의 JSON 바이트 (모든 사용자가 같으므로 한 번만 직렬화)"""
+    word_ids = word_groups.indices(group_index) if group_index < len(word_groups) else ()
+    if corpus.parent is not None:
+        # 개인 단어장: 공유 배치와 같은 묶음은 공유 캐시를 쓰고, 바뀐 묶음은 캐시하지 않음
+        shared_groups = corpus.parent.layout(word_groups.group_size, word_groups.category)
+        if group_index < len(shared_groups) and shared_groups.indices(group_index) == word_ids:
+            return group_words_json(corpus.parent, shared_groups, group_index)
+        return json.dumps(resolve_words(corpus, word_ids), ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+    return group_payloads.get(
+        group_content_key(corpus, word_ids),
+        lambda: json.dumps(resolve_words(corpus, word_ids), ensure_ascii=False,
+                           separators=(',', ':')).encode('utf-8'))
+
+def group_content_key(corpus, word_ids):
+    """묶음 내용 키 (파일 버전 + 단어 ID 해시, 다른 묶음이 바뀌어도 그대로)"""
+    # 같은 파일 버전 안에서는 단어 ID 가 바뀌지 않으므로 ID 가 같으면 내용도 같음
+    return (corpus.name, corpus.base_version, ids_digest(word_ids))
+
+def study_category(progress):
+    """진행 상황에 저장된 학습 카테고리 ('전체' 면 None)"""
+    category = progress.get('category')
+    return None if category in (None, ALL_CATEGORIES) else category
+
+def group_response(fields, current_set=None):
+    """JSON 응답 생성 (current_set 이 미리 직렬화된 바이트면 다시 인코딩하지 않고 끼워 넣음)"""
+    body = json.dumps(fields, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if current_set is not None:
+        if not isinstance(current_set, bytes):
+            current_set = json.dumps(current_set, ensure_ascii=False,
+                                     separators=(',', ':')).encode('utf-8')
+        rest = b',' + body[1:] if fields else b'}'
+        body = b'{"current_set":' + current_set + rest
+    return app.response_class(body, mimetype='application/json')
+
+def corpus_etag(corpus, *parts):
+    """코퍼스 버전(+묶음 번호 등)으로 만든 강한 ETag 값"""
+    return '-'.join([corpus.name, corpus.version] + [str(p) for p in parts])
+
+def cached_corpus_response(etag, build_response):
+    """If-None-Match 가 같으면 본문을 만들지 않고 304, 아니면 ETag/Cache-Control 을 붙여 응답"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = build_response()
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = CORPUS_CACHE_MAX_AGE
+    return response
+
+def session_base_version(session_version):
+    """세션 코퍼스 버전의 파일 버전 부분 (저널 항목 수와 개인 단어장 번호 제외)"""
+    return (session_version or '').split('~')[0].split('.')[0]
 
-def save_words(words):
-    """단어 JSON에 저장"""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(WORDS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(words, f, ensure_ascii=False, indent=2)
+def session_corpus(user_session):
+    """세션을 만든 코퍼스 버전 (더 이상 없으면 세션의 단어를 현재 코퍼스로 옮기고 현재 코퍼스)
+
+    틀린 단어 표시는 옮긴 단어 목록의 위치에 맞춰 유지한다.
+    """
+    corpus = decks.snapshot(user_session.username, user_session.mode, user_session.corpus_version)
+    if corpus is not None:
+        return corpus
+    corpus = get_corpus(user_session.mode, user_session.username)
+    group_index = user_session.group_index
+    if session_base_version(user_session.corpus_version) == corpus.base_version:
+        # 압축 전이면 단어 ID 가 그대로이므로 세션의 단어(틀린 단어 반복 중이면 그 단어들)를 유지
+        positions = [i for i, word_id in enumerate(user_session.word_ids) if word_id < len(corpus.words)]
+        word_ids = [user_session.word_ids[i] for i in positions]
+        incorrect = [j for j, i in enumerate(positions) if user_session.is_incorrect(i)]
+    else:
+        # ID 가 다시 매겨졌으면 같은 묶음을 다시 불러옴 (묶음 구성은 압축 후에도 유지됨)
+        progress = get_user_progress(user_session.username, corpus.name)
+        word_groups = corpus.layout(10, study_category(progress))
+        group_index = min(group_index, max(len(word_groups) - 1, 0))
+        word_ids = word_groups.indices(group_index) if len(word_groups) else []
+        # 세션이 묶음 전체였을 때만 위치별 틀린 단어 표시가 새 묶음에도 맞음
+        if len(word_ids) == len(user_session.word_ids):
+            incorrect = [i for i in range(len(word_ids)) if user_session.is_incorrect(i)]
+        else:
+            # 틀린 단어 반복 중이었으면 어떤 단어였는지 알 수 없으므로 묶음 전체를 다시 반복
+            incorrect = range(len(word_ids)) if user_session.incorrect else ()
+    user_session.move_to(corpus.name, corpus.version, group_index, word_ids, incorrect)
+    return corpus
+
+def session_words(user_session):
+    """세션의 현재 단어 목록 (세션을 만든 코퍼스 버전 기준)"""
+    corpus = session_corpus(user_session)
+    return corpus, resolve_words(corpus, user_session.word_ids)
 
 @app.route('/')
 @login_required
@@ -258,19 +422,12 @@ def api_login():
     password = data.get('password', '')
     remember = data.get('remember', False)  # 로그인 상태 유지 옵션
     
-    # users.json 파일 다시 로드 (변경사항 반영)
-    users = load_users()
-    
-    if username in users:
-        user_data = users[username]
-        # 새 구조와 기존 구조 모두 지원
-        user_password = user_data.get('password', user_data) if isinstance(user_data, dict) else user_data
-        
-        if user_password == password:
-            session.permanent = remember  # 로그인 상태 유지 설정
-            session['logged_in'] = True
-            session['username'] = username
-            return jsonify({'success': True})
+    user_password = get_user_password(username)
+    if user_password is not None and user_password == password:
+        session.permanent = remember  # 로그인 상태 유지 설정
+        session['logged_in'] = True
+        session['username'] = username
+        return jsonify({'success': True})
     
     return jsonify({'success': False, 'message': '아이디 또는 비밀번호가 올바르지 않습니다.'}), 401
 
@@ -284,8 +441,8 @@ def logout():
 def api_init():
     """초기화 및 사용자 진행 상황에서 단어 로드"""
     username = session.get('username')
-    words = load_words()
-    categories = sorted(list(set(w.get('category', '기타') for w in words)))
+    corpus = get_corpus('Words', username)
+    categories = corpus.category_names
     
     # 세션 ID 생성
     session_id = request.args.get('session_id', str(random.randint(100000, 999999)))
@@ -293,54 +450,44 @@ def api_init():
     # 사용자 진행 상황 로드
     progress = get_user_progress(username, 'Words')
     
-    # 단어를 10개씩 묶음으로 생성
-    word_groups = create_word_groups(words, 10)
+    # 단어를 10개씩 묶음으로 생성 (선택한 카테고리가 있으면 그 카테고리만)
+    word_groups = corpus.layout(10, study_category(progress))
     
     # 현재 학습할 묶음 인덱스
-    current_group_idx = progress.get('current_group_index', 0)
+    current_group_idx = word_groups.next_nonempty(progress.get('current_group_index', 0))
     
     # 복습 모드는 제거 (틀린 단어만 반복하는 방식으로 변경)
     review_mode = False
     
     # 일반 모드: 현재 묶음 1개(10개 단어) 로드
     if current_group_idx < len(word_groups):
-        current_group = word_groups[current_group_idx]
-        all_nine_words = current_group['words']
+        word_ids = word_groups.indices(current_group_idx)
         message = f"📖 {current_group_idx+1}번 묶음 학습 중"
     else:
         # 모든 단어 완료
-        all_nine_words = []
+        word_ids = []
         message = "🎉 모든 단어 학습 완료!"
     
-    sessions[session_id] = {
-        'all_nine_words': all_nine_words,
-        'word_groups': word_groups,
-        'repeat_count': 0,
-        'correct_count': 0,
-        'total_attempts': 0,
-        'current_mode': 'Words',
-        'current_group_index': current_group_idx,
-        'review_mode': review_mode,
-        'username': username,
-        'incorrect_words': []  # 틀린 단어 추적
-    }
+    # 세션에는 단어 ID 만 저장 (단어 내용은 공유 코퍼스에서 조회)
+    user_session = StudySession(username, 'Words')
+    user_session.load_group('Words', corpus.version, current_group_idx, word_ids, review_mode)
+    sessions[session_id] = user_session
     
-    # 전체 9개 단어를 current_set으로 전송
-    current_set = all_nine_words
+    # 전체 9개 단어를 current_set으로 전송 (묶음 단어는 미리 직렬화된 바이트 사용)
+    current_set = group_words_json(corpus, word_groups, current_group_idx)
     
-    return jsonify({
+    return group_response({
         'session_id': session_id,
         'categories': categories,
-        'current_set': current_set,
         'repeat_count': 0,
         'max_repeats': 3,
         'user_progress': progress,
         'message': message,
         'review_mode': review_mode,
         'current_group_index': current_group_idx,
-        'total_words_count': len(words),
+        'total_words_count': len(corpus),
         'total_groups': len(word_groups)
-    })
+    }, current_set)
 
 @app.route('/api/load-words-sheet', methods=['POST'])
 @login_required
@@ -348,12 +495,12 @@ def load_words_sheet():
     """Words 탭 로드"""
     session_id = request.json.get('session_id')
     username = session.get('username')
-    words = load_words()
+    corpus = get_corpus('Words', username)
     progress = get_user_progress(username, 'Words')
     
     # 단어 묶음 생성 (10개씩)
-    word_groups = create_word_groups(words, 10)
-    current_group_idx = progress.get('current_group_index', 0)
+    word_groups = corpus.layout(10, study_category(progress))
+    current_group_idx = word_groups.next_nonempty(progress.get('current_group_index', 0))
     
     # 범위를 벗어났으면 처음으로 돌아가기
     if current_group_idx >= len(word_groups):
@@ -363,39 +510,32 @@ def load_words_sheet():
     
     # 현재 묶음 1개(10개 단어) 로드
     if current_group_idx < len(word_groups):
-        current_group = word_groups[current_group_idx]
-        all_nine_words = current_group['words']
+        word_ids = word_groups.indices(current_group_idx)
         message = f"📖 {current_group_idx+1}번 묶음"
     else:
-        all_nine_words = []
+        word_ids = []
         message = "🎉 모든 단어 학습 완료!"
     
-    if session_id in sessions:
-        sessions[session_id]['all_nine_words'] = all_nine_words
-        sessions[session_id]['repeat_count'] = 0
-        sessions[session_id]['current_mode'] = 'Words'
-        sessions[session_id]['correct_count'] = 0
-        sessions[session_id]['total_attempts'] = 0
-        sessions[session_id]['username'] = username
-        sessions[session_id]['review_mode'] = False
-        sessions[session_id]['current_group_index'] = current_group_idx
-        sessions[session_id]['incorrect_words'] = []
+    user_session = sessions.get(session_id)
+    if user_session:
+        user_session.username = username
+        user_session.load_group(corpus.name, corpus.version, current_group_idx, word_ids)
+        sessions[session_id] = user_session
     
-    # 전체 9개 단어를 current_set으로 전송
-    current_set = all_nine_words
+    # 전체 9개 단어를 current_set으로 전송 (묶음 단어는 미리 직렬화된 바이트 사용)
+    current_set = group_words_json(corpus, word_groups, current_group_idx)
     
-    return jsonify({
-        'current_set': current_set,
+    return group_response({
         'repeat_count': 0,
         'correct_count': 0,
         'total_attempts': 0,
         'user_progress': progress,
         'message': message,
         'review_mode': False,
-        'total_words_count': len(words),
+        'total_words_count': len(corpus),
         'current_group_index': current_group_idx,
         'total_groups': len(word_groups)
-    })
+    }, current_set)
 
 @app.route('/api/load-ed-sheet', methods=['POST'])
 @login_required
@@ -403,16 +543,15 @@ def load_ed_sheet():
     """ed (Past Tense) 탭 로드"""
     session_id = request.json.get('session_id')
     username = session.get('username')
-    ed_words = load_ed_words()
-    
-    if not ed_words:
+    corpus = get_corpus('ed', username)
+    if not corpus:
         return jsonify({'error': 'No ed words available'}), 404
     
     progress = get_user_progress(username, 'ed')
     
     # 단어 묶음 생성 (10개씩)
-    word_groups = create_word_groups(ed_words, 10)
-    current_group_idx = progress.get('current_group_index', 0)
+    word_groups = corpus.layout(10, study_category(progress))
+    current_group_idx = word_groups.next_nonempty(progress.get('current_group_index', 0))
     
     # 범위를 벗어났으면 처음으로 돌아가기
     if current_group_idx >= len(word_groups):
@@ -422,29 +561,22 @@ def load_ed_sheet():
     
     # 현재 묶음 1개(10개 단어) 로드
     if current_group_idx < len(word_groups):
-        current_group = word_groups[current_group_idx]
-        all_nine_words = current_group['words']
+        word_ids = word_groups.indices(current_group_idx)
         message = f"📖 {current_group_idx+1}번 묶음"
     else:
-        all_nine_words = []
+        word_ids = []
         message = "🎉 모든 단어 학습 완료!"
     
-    if session_id in sessions:
-        sessions[session_id]['all_nine_words'] = all_nine_words
-        sessions[session_id]['repeat_count'] = 0
-        sessions[session_id]['current_mode'] = 'ed'
-        sessions[session_id]['correct_count'] = 0
-        sessions[session_id]['total_attempts'] = 0
-        sessions[session_id]['username'] = username
-        sessions[session_id]['review_mode'] = False
-        sessions[session_id]['current_group_index'] = current_group_idx
-        sessions[session_id]['incorrect_words'] = []
+    user_session = sessions.get(session_id)
+    if user_session:
+        user_session.username = username
+        user_session.load_group(corpus.name, corpus.version, current_group_idx, word_ids)
+        sessions[session_id] = user_session
     
-    # 전체 9개 단어를 current_set으로 전송
-    current_set = all_nine_words
+    # 전체 9개 단어를 current_set으로 전송 (묶음 단어는 미리 직렬화된 바이트 사용)
+    current_set = group_words_json(corpus, word_groups, current_group_idx)
     
-    return jsonify({
-        'current_set': current_set,
+    return group_response({
         'repeat_count': 0,
         'correct_count': 0,
         'total_attempts': 0,
@@ -452,10 +584,10 @@ def load_ed_sheet():
         'user_progress': progress,
         'message': message,
         'review_mode': False,
-        'total_words_count': len(ed_words),
+        'total_words_count': len(corpus),
         'current_group_index': current_group_idx,
         'total_groups': len(word_groups)
-    })
+    }, current_set)
 
 @app.route('/api/load-yb-sheet', methods=['POST'])
 @login_required
@@ -463,16 +595,15 @@ def load_yb_sheet():
     """YB 영한사전 탭 로드"""
     session_id = request.json.get('session_id')
     username = session.get('username')
-    yb_words = load_yb_words()
-    
-    if not yb_words:
+    corpus = get_corpus('yb', username)
+    if not corpus:
         return jsonify({'error': 'No YB words available'}), 404
     
     progress = get_user_progress(username, 'yb')
     
     # 단어 묶음 생성
-    word_groups = create_word_groups(yb_words, 10)
-    current_group_idx = progress.get('current_group_index', 0)
+    word_groups = corpus.layout(10, study_category(progress))
+    current_group_idx = word_groups.next_nonempty(progress.get('current_group_index', 0))
     
     # 범위를 벗어났으면 처음으로 돌아가기
     if current_group_idx >= len(word_groups):
@@ -482,29 +613,22 @@ def load_yb_sheet():
     
     # 현재 묶음 1개(10개 단어) 로드
     if current_group_idx < len(word_groups):
-        current_group = word_groups[current_group_idx]
-        all_nine_words = current_group['words']
+        word_ids = word_groups.indices(current_group_idx)
         message = f"📖 {current_group_idx+1}번 묶음 (10개 단어)\n총 {len(word_groups)}개 묶음 중 {current_group_idx+1}번째 학습"
     else:
-        all_nine_words = []
+        word_ids = []
         message = "🎉 모든 단어 학습 완료!"
     
-    if session_id in sessions:
-        sessions[session_id]['all_nine_words'] = all_nine_words
-        sessions[session_id]['repeat_count'] = 0
-        sessions[session_id]['current_mode'] = 'yb'
-        sessions[session_id]['correct_count'] = 0
-        sessions[session_id]['total_attempts'] = 0
-        sessions[session_id]['username'] = username
-        sessions[session_id]['review_mode'] = False
-        sessions[session_id]['current_group_index'] = current_group_idx
-        sessions[session_id]['incorrect_words'] = []
+    user_session = sessions.get(session_id)
+    if user_session:
+        user_session.username = username
+        user_session.load_group(corpus.name, corpus.version, current_group_idx, word_ids)
+        sessions[session_id] = user_session
     
-    # 전체 9개 단어를 current_set으로 전송
-    current_set = all_nine_words
+    # 전체 9개 단어를 current_set으로 전송 (묶음 단어는 미리 직렬화된 바이트 사용)
+    current_set = group_words_json(corpus, word_groups, current_group_idx)
     
-    return jsonify({
-        'current_set': current_set,
+    return group_response({
         'repeat_count': 0,
         'correct_count': 0,
         'total_attempts': 0,
@@ -512,10 +636,10 @@ def load_yb_sheet():
         'user_progress': progress,
         'message': message,
         'review_mode': False,
-        'total_words_count': len(yb_words),
+        'total_words_count': len(corpus),
         'current_group_index': current_group_idx,
         'total_groups': len(word_groups)
-    })
+    }, current_set)
 
 @app.route('/api/load-numbers-sheet', methods=['POST'])
 @login_required
@@ -523,16 +647,15 @@ def load_numbers_sheet():
     """숫자/날짜 탭 로드"""
     session_id = request.json.get('session_id')
     username = session.get('username')
-    numbers_words = load_numbers_dates()
-    
-    if not numbers_words:
+    corpus = get_corpus('numbers', username)
+    if not corpus:
         return jsonify({'error': 'No numbers/dates data available'}), 404
     
     progress = get_user_progress(username, 'numbers')
     
     # 단어 묶음 생성 (10개씩)
-    word_groups = create_word_groups(numbers_words, 10)
-    current_group_idx = progress.get('current_group_index', 0)
+    word_groups = corpus.layout(10, study_category(progress))
+    current_group_idx = word_groups.next_nonempty(progress.get('current_group_index', 0))
     
     # 범위를 벗어났으면 처음으로 돌아가기
     if current_group_idx >= len(word_groups):
@@ -542,29 +665,22 @@ def load_numbers_sheet():
     
     # 현재 묶음 1개(10개 단어) 로드
     if current_group_idx < len(word_groups):
-        current_group = word_groups[current_group_idx]
-        all_nine_words = current_group['words']
+        word_ids = word_groups.indices(current_group_idx)
         message = f"📖 {current_group_idx+1}번 묶음 (10개 단어)\n총 {len(word_groups)}개 묶음 중 {current_group_idx+1}번째 학습"
     else:
-        all_nine_words = []
+        word_ids = []
         message = "🎉 모든 단어 학습 완료!"
     
-    if session_id in sessions:
-        sessions[session_id]['all_nine_words'] = all_nine_words
-        sessions[session_id]['repeat_count'] = 0
-        sessions[session_id]['current_mode'] = 'numbers'
-        sessions[session_id]['correct_count'] = 0
-        sessions[session_id]['total_attempts'] = 0
-        sessions[session_id]['username'] = username
-        sessions[session_id]['review_mode'] = False
-        sessions[session_id]['current_group_index'] = current_group_idx
-        sessions[session_id]['incorrect_words'] = []
+    user_session = sessions.get(session_id)
+    if user_session:
+        user_session.username = username
+        user_session.load_group(corpus.name, corpus.version, current_group_idx, word_ids)
+        sessions[session_id] = user_session
     
-    # 전체 9개 단어를 current_set으로 전송
-    current_set = all_nine_words
+    # 전체 9개 단어를 current_set으로 전송 (묶음 단어는 미리 직렬화된 바이트 사용)
+    current_set = group_words_json(corpus, word_groups, current_group_idx)
     
-    return jsonify({
-        'current_set': current_set,
+    return group_response({
         'repeat_count': 0,
         'correct_count': 0,
         'total_attempts': 0,
@@ -572,10 +688,28 @@ def load_numbers_sheet():
         'user_progress': progress,
         'message': message,
         'review_mode': False,
-        'total_words_count': len(numbers_words),
+        'total_words_count': len(corpus),
         'current_group_index': current_group_idx,
         'total_groups': len(word_groups)
-    })
+    }, current_set)
+
+def grade_answer(mode, user_input, word_data):
+    """모드별 채점 (user_input 은 소문자/공백 제거된 값)"""
+    if mode == 'ed':
+        parts = user_input.split('/')
+        return (len(parts) == 2 and
+                parts[0].strip() == word_data.get('word', '').lower() and
+                parts[1].strip() == word_data.get('past_tense', '').lower())
+    if mode in ('Words', 'yb', 'numbers'):
+        return user_input == word_data['word'].lower()
+    return False
+
+def record_attempt(username, mode, word_data, is_correct, latency_ms):
+    """답안 시도 로그 기록 (잘못된 응답 시간은 버림)"""
+    if not isinstance(latency_ms, (int, float)) or latency_ms < 0:
+        latency_ms = None
+    attempt_log.record(username, mode, word_data.get('word', ''), is_correct,
+                       int(latency_ms) if latency_ms is not None else None)
 
 @app.route('/api/check-answer', methods=['POST'])
 @login_required
@@ -586,50 +720,44 @@ def check_answer():
     user_input = data.get('user_input', '').lower().strip()
     word_data = data.get('word_data')
     mode = data.get('mode', 'Words')
+    latency_ms = data.get('latency_ms')  # 단어 표시부터 제출까지 걸린 시간
     
     user_session = sessions.get(session_id)
     if not user_session:
         return jsonify({'error': 'Session not found'}), 404
     
-    is_correct = False
+    # 세션의 단어 ID 로 서버 쪽 단어를 찾아서 채점 (없으면 보낸 단어로 채점)
+    position = user_session.position_of(word_data.get('id'))
+    if position >= 0:
+        corpus = decks.snapshot(user_session.username, user_session.mode, user_session.corpus_version)
+        if corpus is not None:
+            word_data = corpus.words[user_session.word_ids[position]]
     
-    if mode == 'Words':
-        is_correct = user_input == word_data['word'].lower()
-    elif mode == 'ed':
-        parts = user_input.split('/')
-        if len(parts) == 2:
-            is_correct = (parts[0].strip() == word_data.get('word', '').lower() and 
-                         parts[1].strip() == word_data.get('past_tense', '').lower())
-    elif mode == 'yb':
-        is_correct = user_input == word_data['word'].lower()
-    elif mode == 'numbers':
-        is_correct = user_input == word_data['word'].lower()
+    is_correct = grade_answer(mode, user_input, word_data)
     
     if is_correct:
-        user_session['correct_count'] += 1
-    else:
-        # 틀린 단어 기록 (중복 방지)
-        if 'incorrect_words' not in user_session:
-            user_session['incorrect_words'] = []
-        # word_data가 이미 incorrect_words에 없으면 추가
-        already_exists = any(w.get('word') == word_data.get('word') for w in user_session['incorrect_words'])
-        if not already_exists:
-            user_session['incorrect_words'].append(word_data)
-    user_session['total_attempts'] += 1
+        user_session.correct_count += 1
+    elif position >= 0:
+        # 틀린 단어 기록 (위치별 비트라서 중복 확인 없이 O(1))
+        user_session.mark_incorrect(position)
+    user_session.total_attempts += 1
+    sessions[session_id] = user_session
     
     # 사용자 진행 상황 저장
-    username = user_session.get('username')
+    username = user_session.username
+    if username:
+        record_attempt(username, mode, word_data, is_correct, latency_ms)
     if username and is_correct:
         progress = get_user_progress(username, mode)
         progress['completed_count'] = progress.get('completed_count', 0) + 1
         save_user_progress(username, mode, progress)
     
-    accuracy = (user_session['correct_count'] / user_session['total_attempts'] * 100) if user_session['total_attempts'] > 0 else 0
+    accuracy = (user_session.correct_count / user_session.total_attempts * 100) if user_session.total_attempts > 0 else 0
     
     return jsonify({
         'is_correct': is_correct,
-        'correct_count': user_session['correct_count'],
-        'total_attempts': user_session['total_attempts'],
+        'correct_count': user_session.correct_count,
+        'total_attempts': user_session.total_attempts,
         'accuracy': round(accuracy, 1)
     })
 
@@ -646,10 +774,7 @@ def next_word():
         return jsonify({'error': 'Session not found'}), 404
     
     # 전체 단어 수 확인
-    all_nine_words = user_session.get('all_nine_words', [])
-    total_words = len(all_nine_words)
-    
-    print(f"DEBUG: current_index={current_index}, total_words={total_words}, all_nine_words length={len(all_nine_words)}")
+    total_words = len(user_session.word_ids)
     
     if total_words == 0:
         return jsonify({'error': 'No words in session', 'action': 'error'}), 400
@@ -657,70 +782,135 @@ def next_word():
     # 마지막 단어가 아니면 다음 단어로
     if current_index < total_words - 1:
         return jsonify({'action': 'next_word', 'index': current_index + 1})
-    else:
-        # 모든 단어 완료 - 10개 묶음 완료
-        username = user_session.get('username')
-        current_mode = user_session.get('current_mode', 'Words')
-        
-        # 틀린 단어가 있는지 확인
-        incorrect_words = user_session.get('incorrect_words', [])
+    response = finish_group(session_id, user_session)
+    current_set = response.pop('current_set', None)
+    return group_response(response, current_set)
+
+def finish_group(session_id, user_session):
+    """묶음의 마지막 단어 이후 동작 (틀린 단어 반복 또는 다음 묶음)"""
+    username = user_session.username
+    current_mode = user_session.mode
+    
+    # 틀린 단어가 있는지 확인 (세션의 코퍼스 버전이 버려졌으면 먼저 현재 코퍼스로 옮김)
+    if user_session.incorrect:
+        corpus = session_corpus(user_session)
+    if user_session.incorrect:
+        # 틀린 단어만 반복
+        user_session.restart(user_session.incorrect_ids())
+        incorrect_words = resolve_words(corpus, user_session.word_ids)
+        sessions[session_id] = user_session
+        return {
+            'action': 'repeat_incorrect',
+            'current_set': incorrect_words,
+            'message': f'틀린 {len(incorrect_words)}개 단어를 다시 학습합니다.'
+        }
+    
+    # 틀린 단어가 없으면 다음 묶음으로
+    progress = get_user_progress(username, current_mode)
+    
+    # 다음 묶음 데이터 로드
+    corpus = get_corpus(current_mode, username)
+    word_groups = corpus.layout(10, study_category(progress))
+    new_group_index = word_groups.next_nonempty(progress.get('current_group_index', 0) + 1)
+    
+    # 모든 묶음을 완료했으면 처음으로
+    if new_group_index >= len(word_groups):
+        new_group_index = 0
+    progress['current_group_index'] = new_group_index
+    save_user_progress(username, current_mode, progress)
+    
+    # 다음 묶음 로드
+    if new_group_index < len(word_groups):
+        word_ids = word_groups.indices(new_group_index)
+        user_session.load_group(corpus.name, corpus.version, new_group_index, word_ids)
+        sessions[session_id] = user_session
         
-        if incorrect_words:
-            # 틀린 단어만 반복
-            user_session['all_nine_words'] = incorrect_words
-            user_session['incorrect_words'] = []  # 초기화
-            user_session['correct_count'] = 0
-            user_session['total_attempts'] = 0
-            return jsonify({
-                'action': 'repeat_incorrect',
-                'current_set': incorrect_words,
-                'message': f'틀린 {len(incorrect_words)}개 단어를 다시 학습합니다.'
-            })
+        return {
+            'action': 'next_set',
+            'current_set': group_words_json(corpus, word_groups, new_group_index),
+            'current_group_index': new_group_index,
+            'total_groups': len(word_groups),
+            'message': f'{new_group_index + 1}번 묶음으로 이동합니다.'
+        }
+    return {'action': 'set_complete', 'repeat_count': 0}
+
+def current_word(corpus, session_version, word_id, word=None):
+    """세션의 코퍼스 버전이 버려졌을 때 현재 코퍼스에서 답안의 단어 찾기 (없으면 None)
+
+    단어 문자열로 찾고, 없으면 같은 파일 버전(압축/재로드 전)일 때만 ID 를 그대로 쓴다.
+    """
+    if word:
+        ids = corpus.ids_of(str(word))
+        if ids:
+            return corpus.words[ids[0]]
+    if session_base_version(session_version) == corpus.base_version and word_id < len(corpus.words):
+        return corpus.words[word_id]
+    return None
+
+@app.route('/api/submit-answers', methods=['POST'])
+@login_required
+def submit_answers():
+    """한 묶음의 답안을 한 번에 채점하고 진행 상황 저장 후 다음 동작 반환"""
+    data = request.json
+    session_id = data.get('session_id')
+    mode = data.get('mode', 'Words')
+    answers = data.get('answers') or []
+    
+    user_session = sessions.get(session_id)
+    if not user_session:
+        return jsonify({'error': 'Session not found'}), 404
+    
+    # 세션을 만든 코퍼스 버전으로 채점 (세션에 없는 단어 ID 의 답안은 무시)
+    corpus = decks.snapshot(user_session.username, user_session.mode, user_session.corpus_version)
+    current = None
+    if corpus is None:
+        # 그 버전이 더 이상 없으면 현재 코퍼스에서 같은 단어를 찾아 채점
+        current = get_corpus(user_session.mode, user_session.username)
+    username = user_session.username
+    results = []
+    newly_correct = 0
+    for answer in answers:
+        position = user_session.position_of(answer.get('id'))
+        if position < 0:
+            continue
+        word_id = user_session.word_ids[position]
+        if corpus is not None:
+            word_data = corpus.words[word_id]
+        else:
+            word_data = current_word(current, user_session.corpus_version, word_id, answer.get('word'))
+            if word_data is None:
+                continue
+        user_input = str(answer.get('user_input', '')).lower().strip()
+        is_correct = grade_answer(mode, user_input, word_data)
+        if is_correct:
+            user_session.correct_count += 1
+            newly_correct += 1
         else:
-            # 틀린 단어가 없으면 다음 묶음으로
-            progress = get_user_progress(username, current_mode)
-            new_group_index = progress.get('current_group_index', 0) + 1
-            progress['current_group_index'] = new_group_index
-            save_user_progress(username, current_mode, progress)
-            
-            # 다음 묶음 데이터 로드
-            if current_mode == 'ed':
-                words = load_ed_words()
-            elif current_mode == 'yb':
-                words = load_yb_words()
-            elif current_mode == 'numbers':
-                words = load_numbers_dates()
-            else:
-                words = load_words()
-            
-            word_groups = create_word_groups(words, 10)
-            
-            # 모든 묶음을 완료했는지 확인
-            if new_group_index >= len(word_groups):
-                new_group_index = 0
-                progress['current_group_index'] = 0
-                save_user_progress(username, current_mode, progress)
-            
-            # 다음 묶음 로드
-            if new_group_index < len(word_groups):
-                current_group = word_groups[new_group_index]
-                all_nine_words = current_group['words']
-                
-                user_session['all_nine_words'] = all_nine_words
-                user_session['current_group_index'] = new_group_index
-                user_session['correct_count'] = 0
-                user_session['total_attempts'] = 0
-                user_session['incorrect_words'] = []
-                
-                return jsonify({
-                    'action': 'next_set',
-                    'current_set': all_nine_words,
-                    'current_group_index': new_group_index,
-                    'total_groups': len(word_groups),
-                    'message': f'{new_group_index + 1}번 묶음으로 이동합니다.'
-                })
-            else:
-                return jsonify({'action': 'set_complete', 'repeat_count': 0})
+            user_session.mark_incorrect(position)
+        user_session.total_attempts += 1
+        if username:
+            record_attempt(username, mode, word_data, is_correct, answer.get('latency_ms'))
+        results.append({'id': answer.get('id'), 'is_correct': is_correct})
+    
+    # 진행 상황은 묶음당 한 번만 저장
+    if username and newly_correct:
+        progress = get_user_progress(username, mode)
+        progress['completed_count'] = progress.get('completed_count', 0) + newly_correct
+        save_user_progress(username, mode, progress)
+    
+    correct_count = user_session.correct_count
+    total_attempts = user_session.total_attempts
+    accuracy = (correct_count / total_attempts * 100) if total_attempts > 0 else 0
+    
+    response = finish_group(session_id, user_session)
+    current_set = response.pop('current_set', None)
+    response.update({
+        'results': results,
+        'correct_count': correct_count,
+        'total_attempts': total_attempts,
+        'accuracy': round(accuracy, 1)
+    })
+    return group_response(response, current_set)
 
 @app.route('/api/next-nine-words', methods=['POST'])
 @login_required
@@ -734,93 +924,75 @@ def next_nine_words():
     if not user_session:
         return jsonify({'error': 'Session not found'}), 404
     
-    username = user_session.get('username')
-    # 세션의 모드 업데이트
-    user_session['current_mode'] = mode
+    username = user_session.username
     progress = get_user_progress(username, mode)
     
+    # 카테고리를 바꾸면 그 카테고리의 첫 묶음부터 시작
+    category = data.get('category')
+    if category and category != progress.get('category', ALL_CATEGORIES):
+        progress['category'] = category
+        progress['current_group_index'] = 0
+        save_user_progress(username, mode, progress)
+    
     # 모드에 따라 다른 파일 로드
-    if mode == 'ed':
-        words = load_ed_words()
-    elif mode == 'yb':
-        words = load_yb_words()
-    elif mode == 'numbers':
-        words = load_numbers_dates()
-    else:
-        words = load_words()
+    corpus = get_corpus(mode, username)
     
     # 10개씩 묶음
-    word_groups = create_word_groups(words, 10)
-    current_group_idx = progress.get('current_group_index', 0)
+    word_groups = corpus.layout(10, study_category(progress))
+    current_group_idx = word_groups.next_nonempty(progress.get('current_group_index', 0))
     
     # 모든 단어를 학습했으면 처음으로 돌아가기
-    if current_group_idx >= len(word_groups):
+    wrapped = current_group_idx >= len(word_groups)
+    if wrapped:
         current_group_idx = 0
         progress['current_group_index'] = 0
         save_user_progress(username, mode, progress)
     
     if current_group_idx < len(word_groups):
-        current_group = word_groups[current_group_idx]
-        all_nine_words = current_group['words']
-        
-        user_session['all_nine_words'] = all_nine_words
-        user_session['repeat_count'] = 0
-        user_session['correct_count'] = 0
-        user_session['total_attempts'] = 0
-        user_session['current_group_index'] = current_group_idx
-        user_session['incorrect_words'] = []
+        word_ids = word_groups.indices(current_group_idx)
+        # 세션의 모드와 묶음 업데이트
+        user_session.load_group(corpus.name, corpus.version, current_group_idx, word_ids)
+        sessions[session_id] = user_session
         
         # 전체 10개 단어를 current_set으로 전송
-        current_set = all_nine_words
+        current_set = group_words_json(corpus, word_groups, current_group_idx)
         
         completion_message = ""
-        if current_group_idx == 0 and progress.get('completed_count', 0) > 0:
+        if wrapped:
             completion_message = " (🎉 모든 단어 완료! 처음부터 다시 시작합니다)"
         
-        return jsonify({
-            'current_set': current_set,
+        return group_response({
             'repeat_count': 0,
             'message': f"{current_group_idx+1}번 묶음{completion_message}",
             'current_group_index': current_group_idx,
             'total_groups': len(word_groups)
-        })
+        }, current_set)
     else:
         return jsonify({'error': '단어 로드 실패'}), 404
 
 def start_review_mode(session_id, username, mode):
     """복습 모드 시작"""
     # 모드에 따라 다른 파일 로드
-    if mode == 'ed':
-        words = load_ed_words()
-    elif mode == 'yb':
-        words = load_yb_words()
-    elif mode == 'numbers':
-        words = load_numbers_dates()
-    else:
-        words = load_words()
+    corpus = get_corpus(mode, username)
     
-    word_groups = create_word_groups(words, 3)
+    word_groups = corpus.layout(3)
     progress = get_user_progress(username, mode)
     
     review_start = progress.get('review_start_group', 0)
-    review_groups = word_groups[review_start:review_start + 9]
-    all_review_words = []
-    for grp in review_groups:
-        all_review_words.extend(grp['words'])
+    review_ids = word_groups.range_indices(review_start, review_start + 9)
     
     # 27개 중 랜덤으로 섞기
-    random.shuffle(all_review_words)
-    all_nine_words = all_review_words[:27] if len(all_review_words) >= 27 else all_review_words
+    random.shuffle(review_ids)
+    review_ids = review_ids[:27]
     
-    user_session = sessions[session_id]
-    user_session['all_nine_words'] = all_nine_words
-    user_session['repeat_count'] = 0
-    user_session['correct_count'] = 0
-    user_session['total_attempts'] = 0
-    user_session['review_mode'] = True
+    user_session = sessions.get(session_id)
+    if not user_session:
+        return jsonify({'error': 'Session not found'}), 404
+    user_session.load_group(corpus.name, corpus.version, user_session.group_index, review_ids, review_mode=True)
+    sessions[session_id] = user_session
     
     # 복습 모드에서는 전체 27개 단어를 한 번에 전송
-    current_set = all_nine_words
+    current_set = resolve_words(corpus, review_ids)
     
     return jsonify({
         'current_set': current_set,
@@ -866,16 +1038,9 @@ def api_skip_review():
     save_user_progress(username, mode, progress)
     
     # 새로운 9개 묶음 로드
-    if mode == 'ed':
-        words = load_ed_words()
-    elif mode == 'yb':
-        words = load_yb_words()
-    elif mode == 'numbers':
-        words = load_numbers_dates()
-    else:
-        words = load_words()
+    corpus = get_corpus(mode, username)
     
-    word_groups = create_word_groups(words, 3)
+    word_groups = corpus.layout(3)
     
     if new_group_index >= len(word_groups):
         return jsonify({
@@ -884,22 +1049,18 @@ def api_skip_review():
         })
     
     # 새로운 9개 묶음
-    nine_groups = word_groups[new_group_index:new_group_index + 9]
-    all_nine_words = []
-    for grp in nine_groups:
-        all_nine_words.extend(grp['words'])
+    word_ids = word_groups.range_indices(new_group_index, new_group_index + 9)
     
-    random.shuffle(all_nine_words)
+    random.shuffle(word_ids)
     
-    user_session = sessions[session_id]
-    user_session['all_nine_words'] = all_nine_words
-    user_session['repeat_count'] = 0
-    user_session['correct_count'] = 0
-    user_session['total_attempts'] = 0
-    user_session['review_mode'] = False
+    user_session = sessions.get(session_id)
+    if not user_session:
+        return jsonify({'error': 'Session not found'}), 404
+    user_session.load_group(corpus.name, corpus.version, user_session.group_index, word_ids)
+    sessions[session_id] = user_session
     
     return jsonify({
-        'current_set': all_nine_words,
+        'current_set': resolve_words(corpus, word_ids),
         'repeat_count': 0,
         'review_mode': False,
         'message': f'새로운 단어로 이동했습니다! ({new_group_index+1}번째 묶음)'
@@ -912,17 +1073,15 @@ def repeat_nine_words():
     data = request.json
     session_id = data.get('session_id')
     
-    session = sessions.get(session_id)
-    if not session:
+    user_session = sessions.get(session_id)
+    if not user_session:
         return jsonify({'error': 'Session not found'}), 404
     
-    session['repeat_count'] = 0
-    session['correct_count'] = 0
-    session['total_attempts'] = 0
-    session['incorrect_words'] = []
+    user_session.restart()
     
     # 전체 10개 단어 반환
-    current_set = session['all_nine_words']
+    corpus, current_set = session_words(user_session)
+    sessions[session_id] = user_session
     
     return jsonify({
         'current_set': current_set,
@@ -931,76 +1090,366 @@ def repeat_nine_words():
         'total_attempts': 0
     })
 
+def fill_audio(text, fmt, slow):
+    """음성을 만들어 캐시에 저장 ((파일 경로, None), 저장하지 못하면 (None, 음성 바이트))
+
+    합성기 형식이 아니면 원본 음성(캐시된 것 또는 새로 합성)을 한 번 변환해서 저장한다.
+    """
+    key = audio_key(text, 'en', synthesizer.voice, slow, fmt)
+    # 기다리는 동안 다른 워커가 만들었을 수 있음
+    path = audio_cache.get(key, fmt)
+    if path is not None:
+        return path, None
+    if fmt == synthesizer.fmt:
+        audio = synthesizer.synthesize(text, lang='en', slow=slow)
+    else:
+        audio = transcode(read_audio(text, synthesizer.fmt, slow), fmt)
+    try:
+        return audio_cache.put(key, audio, fmt), None
+    except OSError as e:
+        print(f"음성 캐시 저장 오류: {e}")
+        return None, audio
+
+def load_audio(text, fmt, slow=False):
+    """캐시된 음성 (파일 경로, None), 캐시에 없으면 한 번만 만들어서 반환"""
+    key = audio_key(text, 'en', synthesizer.voice, slow, fmt)
+    path = audio_cache.get(key, fmt)
+    if path is not None:
+        return path, None
+    return audio_flights.do(key, lambda: fill_audio(text, fmt, slow))
+
+def load_audio_variant(text, fmt, slow=False):
+    """(보낸 형식, 파일 경로, 음성 바이트) (fmt 로 변환하지 못하면 합성기 형식으로)"""
+    try:
+        return (fmt,) + load_audio(text, fmt, slow)
+    except TranscodeError as e:
+        print(f"음성 변환 오류: {e}")
+        return (synthesizer.fmt,) + load_audio(text, synthesizer.fmt, slow)
+
+def read_audio(text, fmt, slow=False):
+    """음성 바이트 (캐시에 없으면 만들어서 저장)"""
+    path, audio = load_audio(text, fmt, slow)
+    if audio is None:
+        with open(path, 'rb') as f:
+            audio = f.read()
+    return audio
+
+def audio_request_options():
+    """요청의 (형식, 느린 발음 여부) (format 이 없으면 Accept 헤더로 가장 작은 형식 선택)"""
+    fmt = negotiate(request.accept_mimetypes, synthesizer.fmt, request.args.get('format'))
+    slow = request.args.get('slow', '').lower() in ('1', 'true', 'yes')
+    return fmt, slow
+
+def audio_text_error(text):
+    """발음 요청 텍스트 검사 (문제가 없으면 None, 있으면 오류 메시지)"""
+    if len(text) > AUDIO_MAX_TEXT:
+        return f'{AUDIO_MAX_TEXT}자 이하로 요청해주세요.'
+    if text.startswith('-'):
+        # 합성기 명령행 옵션처럼 보이는 텍스트는 받지 않음
+        return "'-' 로 시작하는 텍스트는 발음할 수 없습니다."
+    return None
+
+def audio_response(response, negotiated):
+    if negotiated:
+        # format 없이 요청하면 Accept 에 따라 형식이 달라짐
+        response.vary.add('Accept')
+    return response
+
 @app.route('/api/play-audio', methods=['GET'])
 @login_required
 def play_audio():
-    """단어 발음 생성"""
-    word = request.args.get('word', '')
-    
+    """발음 (word 또는 예문 text, slow=1 이면 느리게, format 으로 형식 지정)
+
+    형식/속도별로 따로 캐시하고, 캐시에 있으면 합성/변환 없이 파일 그대로 전송한다.
+    """
+    text = (request.args.get('text') or request.args.get('word', '')).strip()
+    if not text:
+        return jsonify({'error': 'word is required'}), 400
+    error = audio_text_error(text)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    fmt, slow = audio_request_options()
+    negotiated = 'format' not in request.args
     try:
-        tts = gTTS(text=word, lang='en')
-        audio_fp = io.BytesIO()
-        tts.write_to_fp(audio_fp)
-        audio_fp.seek(0)
-        
-        return send_file(
-            audio_fp,
-            mimetype='audio/mpeg',
-            as_attachment=False,
-            download_name=f'{word}.mp3'
-        )
+        fmt, path, audio = load_audio_variant(text, fmt, slow)
+    except SingleFlightTimeout as e:
+        return jsonify({'error': str(e)}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    
+    key = audio_key(text, 'en', synthesizer.voice, slow, fmt)
+    download_name = f"{text[:40]}.{fmt.split('-')[0]}"
+    if path is None:
+        # 디스크에 쓸 수 없으면 이번만 메모리에서 전송
+        return audio_response(send_file(io.BytesIO(audio), mimetype=MIMETYPES[fmt],
+                                        as_attachment=False, download_name=download_name), negotiated)
+    return audio_response(send_file(
+        path,
+        mimetype=MIMETYPES[fmt],
+        as_attachment=False,
+        download_name=download_name,
+        etag=key,
+        max_age=AUDIO_MAX_AGE
+    ), negotiated)
+
+@app.route('/api/audio-bundle', methods=['GET'])
+@login_required
+def audio_bundle():
+    """여러 단어의 음성을 한 응답으로 (묶음을 불러올 때 미리 받아 두고 바로 재생)
+
+    본문은 음성 파일을 이어 붙인 바이트이고, X-Audio-Manifest 헤더에 단어별
+    [단어, 시작 바이트, 길이] 목록(JSON)을 담는다. 합성에 실패한 단어는 목록에서 빠지며
+    클라이언트는 그 단어만 /api/play-audio 로 요청한다. format/slow 는 play-audio 와 같다.
+    """
+    # play-audio 와 같은 캐시 키를 쓰도록 앞뒤 공백을 지우고 같은 길이 제한을 적용
+    words = [w.strip() for w in request.args.getlist('w')]
+    words = list(dict.fromkeys(w for w in words if w))[:AUDIO_BUNDLE_MAX_WORDS]
+    if not words:
+        return jsonify({'error': 'w is required'}), 400
+    error = next(filter(None, map(audio_text_error, words)), None)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    fmt, slow = audio_request_options()
+    negotiated = 'format' not in request.args
+    
+    def bundle_items(fmt):
+        def bundle_item(word):
+            try:
+                return read_audio(word, fmt, slow)
+            except TranscodeError:
+                raise
+            except Exception as e:
+                print(f"{word!r} 음성 오류: {e}")
+                return None
+        return list(audio_bundle_pool.map(bundle_item, words))
+    
+    def bundle_etag(fmt):
+        # 같은 단어 목록이면 같은 내용이므로 캐시 키로 ETag 생성
+        keys = [audio_key(w, 'en', synthesizer.voice, slow, fmt) for w in words]
+        return hashlib.sha256(''.join(keys).encode('ascii')).hexdigest()
+    
+    etag = bundle_etag(fmt)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        try:
+            items = bundle_items(fmt)
+        except TranscodeError as e:
+            # 한 형식의 번들에 다른 형식이 섞이지 않도록 전부 합성기 형식으로 다시 만듦
+            print(f"음성 변환 오류: {e}")
+            fmt = synthesizer.fmt
+            etag = bundle_etag(fmt)
+            items = bundle_items(fmt)
+        manifest = []
+        chunks = []
+        offset = 0
+        for word, audio in zip(words, items):
+            if audio is None:
+                continue
+            manifest.append([word, offset, len(audio)])
+            chunks.append(audio)
+            offset += len(audio)
+        response = app.response_class(b''.join(chunks), mimetype=MIMETYPES[fmt])
+        response.headers['X-Audio-Manifest'] = json.dumps(manifest, separators=(',', ':'))
+        if len(manifest) < len(words):
+            # 일부가 빠진 번들은 캐시하지 않음
+            response.cache_control.no_store = True
+            return audio_response(response, negotiated)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = AUDIO_MAX_AGE
+    return audio_response(response, negotiated)
 
 @app.route('/api/add-word', methods=['POST'])
 @login_required
 def add_word():
-    """단어 추가"""
+    """단어 추가 (내 단어장에만, 공유 코퍼스는 단어 파일에서 직접 관리)"""
     data = request.json
     word = data.get('word', '').strip()
     meaning = data.get('meaning', '').strip()
+    mode = data.get('mode', 'Words')
     
     if not word or not meaning:
         return jsonify({'error': 'Word and meaning are required'}), 400
+    if mode not in corpora.names():
+        return jsonify({'error': '알 수 없는 모드입니다.'}), 404
     
-    words = load_words()
-    words.append({
+    new_word = {
         'word': word,
         'meaning': meaning,
         'example': '',
         'category': '기타'
-    })
-    save_words(words)
+    }
+    word_id = decks.add_word(session.get('username'), mode, new_word)
+    if word_id is None:
+        return jsonify({'error': '이미 있는 단어입니다.'}), 409
     
-    return jsonify({'success': True, 'message': '단어가 추가되었습니다.'})
+    return jsonify({'success': True, 'message': '단어가 추가되었습니다.', 'id': word_id})
 
 @app.route('/api/delete-word', methods=['POST'])
 @login_required
 def delete_word():
-    """단어 삭제"""
+    """단어 삭제 (내 단어장에서만, 공유 단어는 내 단어장에서 숨김)"""
     data = request.json
     word = data.get('word', '').strip()
+    mode = data.get('mode', 'Words')
     
-    words = load_words()
-    words = [w for w in words if w['word'].lower() != word.lower()]
-    save_words(words)
+    if mode not in corpora.names():
+        return jsonify({'error': '알 수 없는 모드입니다.'}), 404
+    deleted = decks.delete_word(session.get('username'), mode, word)
+    if not deleted:
+        return jsonify({'error': '없는 단어입니다.'}), 404
     
     return jsonify({'success': True, 'message': '단어가 삭제되었습니다.'})
 
+@app.route('/api/deck', methods=['GET'])
+@login_required
+def get_deck():
+    """내 단어장 (추가한 단어, 숨긴 공유 단어)"""
+    mode = request.args.get('mode', 'Words')
+    if mode not in corpora.names():
+        return jsonify({'error': '알 수 없는 모드입니다.'}), 404
+    return jsonify(dict(decks.deck(session.get('username'), mode), mode=mode))
+
+@app.route('/api/search', methods=['GET'])
+@login_required
+def search_words():
+    """단어 접두어 검색 (q, 모든 모드 또는 mode, 내 단어장 포함, 최대 limit 개)"""
+    query = request.args.get('q', '').strip()
+    mode = request.args.get('mode')
+    if mode is not None and mode not in corpora.names():
+        return jsonify({'error': '알 수 없는 모드입니다.'}), 404
+    try:
+        limit = min(max(int(request.args.get('limit', SEARCH_LIMIT)), 1), SEARCH_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'limit 는 숫자여야 합니다.'}), 400
+    
+    username = session.get('username')
+    modes = [mode] if mode else corpora.names()
+    personal = {m: decks.get(username, m) for m in modes}
+    results = [dict(corpus.word(word_id, ('word', 'meaning', 'past_tense', 'category')), mode=m)
+               for m, corpus, word_id in search_index.search(query, modes, limit, personal)]
+    return jsonify({'query': query, 'results': results})
+
 @app.route('/api/get-words', methods=['GET'])
 @login_required
 def get_words():
-    """모든 단어 조회"""
-    words = load_words()
-    return jsonify(words)
+    """단어 조회
+
+    인자가 없으면 전체 배열을 반환하고 (코퍼스 버전별로 직렬화한 바이트 재사용),
+    cursor/limit/category/prefix/fields 를 주면 페이지 단위로, format=ndjson 이면
+    한 줄에 단어 1개씩 스트리밍한다. mode 로 네 가지 모드 모두 조회할 수 있다.
+    """
+    args = request.args
+    mode = args.get('mode', 'Words')
+    if mode not in corpora.names():
+        return jsonify({'error': '알 수 없는 모드입니다.'}), 404
+    corpus = get_corpus(mode)
+    
+    if not any(key in args for key in ('cursor', 'limit', 'category', 'prefix', 'fields', 'format')):
+        return all_words_response(corpus)
+    
+    try:
+        cursor = int(args.get('cursor', 0))
+        limit = int(args['limit']) if 'limit' in args else None
+    except ValueError:
+        return jsonify({'error': 'cursor 와 limit 는 숫자여야 합니다.'}), 400
+    if limit is not None and limit < 0:
+        return jsonify({'error': 'limit 는 0 이상이어야 합니다.'}), 400
+    category = args.get('category') or None
+    prefix = args.get('prefix') or None
+    fields = [f for f in args['fields'].split(',') if f] if args.get('fields') else None
+    matches = corpus.find(cursor, category=category, prefix=prefix)
+    
+    if args.get('format') == 'ndjson':
+        # 대량 조회용: 조건에 맞는 단어를 한 줄씩 바로 내보냄 (limit 가 없으면 끝까지)
+        def generate():
+            for word_id in itertools.islice(matches, limit):
+                yield json.dumps(corpus.word(word_id, fields), ensure_ascii=False) + '\n'
+        return app.response_class(generate(), mimetype='application/x-ndjson')
+    
+    limit = min(max(limit or GET_WORDS_PAGE_SIZE, 1), GET_WORDS_MAX_PAGE_SIZE)
+    items = []
+    next_cursor = None
+    for word_id in matches:
+        if len(items) == limit:
+            next_cursor = word_id
+            break
+        items.append(corpus.word(word_id, fields))
+    
+    # 코퍼스가 바뀌면 단어 ID 가 달라질 수 있으므로 버전을 같이 보냄
+    return jsonify({
+        'mode': mode,
+        'version': corpus.version,
+        'items': items,
+        'next_cursor': next_cursor
+    })
+
+def all_words_response(corpus):
+    """모드의 전체 단어 배열 (ETag/Cache-Control 포함)"""
+    return cached_corpus_response(corpus_etag(corpus, 'all'), lambda: app.response_class(
+        group_payloads.get((corpus.name, corpus.version, 'all'),
+                           lambda: json.dumps([corpus.words[i] for i in corpus.find()], ensure_ascii=False,
+                                              separators=(',', ':')).encode('utf-8')),
+        mimetype='application/json'))
+
+@app.route('/api/group/<mode>/<int:group_index>', methods=['GET'])
+@login_required
+def get_group(mode, group_index):
+    """k번째 묶음의 단어 목록 (모든 사용자에게 같아서 브라우저/프록시가 캐시 가능)"""
+    if mode not in corpora.names():
+        return jsonify({'error': '알 수 없는 모드입니다.'}), 404
+    corpus = get_corpus(mode)
+    category = request.args.get('category')
+    word_groups = corpus.layout(10, None if category == ALL_CATEGORIES else category)
+    if group_index >= len(word_groups):
+        return jsonify({'error': '묶음 번호가 범위를 벗어났습니다.'}), 404
+    # 헤더는 ASCII 만 쓸 수 있으므로 카테고리 이름은 퍼센트 인코딩
+    # 묶음 구성과 묶음 개수가 그대로면 다른 묶음이 바뀌어도 같은 ETag
+    _, base_version, digest = group_content_key(corpus, word_groups.indices(group_index))
+    etag = '-'.join([mode, base_version, quote(word_groups.category or 'all'),
+                     str(group_index), str(len(word_groups)), digest])
+    return cached_corpus_response(etag, lambda: group_response({
+        'mode': mode,
+        'category': word_groups.category or ALL_CATEGORIES,
+        'current_group_index': group_index,
+        'total_groups': len(word_groups)
+    }, group_words_json(corpus, word_groups, group_index)))
 
 @app.route('/api/get-categories', methods=['GET'])
 @login_required
 def get_categories():
-    """카테고리 조회"""
-    words = load_words()
-    categories = sorted(list(set(w.get('category', '기타') for w in words)))
-    return jsonify(categories)
+    """카테고리 조회 (코퍼스를 읽을 때 만든 카테고리 색인 사용)"""
+    corpus = get_corpus(request.args.get('mode', 'Words'))
+    return jsonify(corpus.category_names)
+
+@app.route('/api/stats', methods=['GET'])
+@login_required
+def api_stats():
+    """캐시/저장소 상태 조회 (운영 확인용)"""
+    return jsonify({
+        'user_cache': users_cache.stats(),
+        'progress_store': {
+            'pending_users': progress_store.pending_count(),
+            'flush_count': progress_store.flush_count
+        },
+        'corpora': corpora.stats(),
+        'corpus_compactions': corpora.compact_count,
+        'corpus_rebases': corpora.rebase_count,
+        'decks': decks.stats(),
+        'search_index': search_index.stats(),
+        'audio_cache': audio_cache.stats(),
+        'audio_flights': audio_flights.stats(),
+        'ai_flights': ai_flights.stats(),
+        'sessions': sessions.stats(),
+        'group_payloads': group_payloads.stats(),
+        'attempt_log': {
+            'buffered': attempt_log.buffered_count(),
+            'written': attempt_log.written_count
+        }
+    })
 
 @app.route('/api/ai-generate-sentences', methods=['POST'])
 @login_required
@@ -1024,8 +1473,12 @@ def ai_generate_sentences():
 3. [영어 문장]
    (한국어 번역)"""
         
-        response = model.generate_content(prompt)
-        return jsonify({'success': True, 'sentences': response.text})
+        # 같은 단어의 예문을 동시에 여러 명이 요청하면 한 번만 생성
+        sentences = ai_flights.do(('sentences', word),
+                                  lambda: model.generate_content(prompt).text)
+        return jsonify({'success': True, 'sentences': sentences})
+    except SingleFlightTimeout as e:
+        return jsonify({'success': False, 'error': str(e)}), 504
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
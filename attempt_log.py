@@ -0,0 +1,243 @@
+"""답안 시도 이벤트 로그 (append-only NDJSON)
+
+정답 확인 요청마다 (사용자, 모드, 단어, 정답 여부, 시각, 응답 시간)을 메모리 버퍼에
+쌓아 두고, 백그라운드 스레드가 모아서 로그 파일 끝에 추가한다. compact() 는 로그를
+사용자/단어별 집계 파일로 합치고 로그를 비운다. 집계 파일에는 마지막으로 합친 로그
+묶음 번호도 함께 저장한다.
+
+    {"batch": "<묶음 번호>", "users": {username: {mode: {word: {...}}}}}
+
+사용법 (집계):
+    python attempt_log.py compact [attempts.ndjson] [attempt_stats.json]
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 실행
+    fcntl = None
+
+WORK_SUFFIX = '.compacting'
+
+
+class AttemptLog:
+    """버퍼링된 append-only 시도 로그 작성기
+
+    stats_path 와 compact_interval 을 주면 백그라운드에서 주기적으로 compact() 도 실행한다.
+    """
+
+    def __init__(self, path, flush_interval=2.0, max_buffer=500, stats_path=None, compact_interval=None):
+        self.path = path
+        self.stats_path = stats_path
+        self.compact_interval = compact_interval
+        self._last_compact = time.monotonic()
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.written_count = 0
+
+    def record(self, username, mode, word, correct, latency_ms=None):
+        """시도 1건 기록 (파일 쓰기는 백그라운드에서)"""
+        event = {'u': username, 'm': mode, 'w': word, 'c': 1 if correct else 0,
+                 't': round(time.time(), 3)}
+        if latency_ms is not None:
+            event['l'] = latency_ms
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.max_buffer:
+                self._wake.set()
+        self._ensure_thread()
+
+    def flush(self):
+        """버퍼에 쌓인 이벤트를 로그 파일 끝에 추가"""
+        with self._write_lock:
+            with self._lock:
+                if not self._buffer:
+                    return 0
+                lines, self._buffer = self._buffer, []
+            # compact() 가 파일을 옮길 수 있으므로 매번 append 모드로 열고,
+            # 쓰는 동안은 공유 잠금으로 다른 프로세스의 compact 가 옮기지 못하게 함
+            with _locked(self.path + '.lock', shared=True):
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(lines))
+            self.written_count += len(lines)
+            return len(lines)
+
+    def buffered_count(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def _ensure_thread(self):
+        if self._thread is not None or self._stop.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='attempt-log', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                self._maybe_compact()
+            except Exception as e:
+                print(f"시도 로그 저장 오류: {e}")
+
+    def _maybe_compact(self):
+        if not self.stats_path or not self.compact_interval:
+            return
+        if time.monotonic() - self._last_compact < self.compact_interval:
+            return
+        self._last_compact = time.monotonic()
+        with self._write_lock:
+            compact(self.path, self.stats_path)
+
+    def close(self):
+        """백그라운드 기록 중지 후 남은 이벤트 저장"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+def load_stats(stats_path):
+    """집계 파일 로드 ({username: {mode: {word: {...}}}})"""
+    return _read_stats(stats_path)[0]
+
+
+def _read_stats(stats_path):
+    """(집계, 마지막으로 합친 묶음 번호) 반환 (묶음 번호가 없던 예전 형식도 읽음)"""
+    if not os.path.exists(stats_path):
+        return {}, None
+    with open(stats_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if 'batch' in data and isinstance(data.get('users'), dict):
+        return data['users'], data['batch']
+    return data, None
+
+
+def apply_event(stats, event):
+    """이벤트 1건을 집계에 반영"""
+    word_stats = stats.setdefault(event['u'], {}).setdefault(event['m'], {}).setdefault(event['w'], {
+        'attempts': 0,
+        'correct': 0,
+        'latency_ms_total': 0,
+        'latency_count': 0,
+        'last_attempt': None
+    })
+    word_stats['attempts'] += 1
+    word_stats['correct'] += event.get('c', 0)
+    if event.get('l') is not None:
+        word_stats['latency_ms_total'] += event['l']
+        word_stats['latency_count'] += 1
+    if word_stats['last_attempt'] is None or event['t'] > word_stats['last_attempt']:
+        word_stats['last_attempt'] = event['t']
+
+
+@contextmanager
+def _locked(lock_path, shared=False):
+    """다른 프로세스와 직렬화하는 파일 잠금 (corpus_journal 과 같은 flock, shared 면 공유 잠금)"""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _work_files(log_path):
+    """이전 compact 가 남긴 작업 파일 [(묶음 번호, 경로)] (만든 순서)"""
+    directory = os.path.dirname(log_path) or '.'
+    prefix = os.path.basename(log_path) + '.'
+    work_files = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(WORK_SUFFIX):
+            batch = name[len(prefix):-len(WORK_SUFFIX)]
+            work_files.append((batch, os.path.join(directory, name)))
+    return sorted(work_files)
+
+
+def compact(log_path, stats_path):
+    """로그를 사용자/단어별 집계 파일에 합치고 로그 비우기 (처리한 이벤트 수 반환)
+
+    여러 워커가 동시에 실행해도 잠금 파일로 한 번에 하나씩만 처리한다. 로그는 묶음 번호를
+    붙인 작업 파일로 옮긴 뒤 합치고, 집계 파일에 그 묶음 번호를 같이 저장하므로 집계를
+    저장한 뒤 작업 파일을 지우기 전에 멈춰도 다음 실행에서 다시 세지 않는다.
+    로그를 옮길 때는 로그 잠금을 단독으로 잡아, flush() 가 쓰는 중인 이벤트가 이미
+    읽은 작업 파일에 들어가 사라지지 않게 한다.
+    """
+    with _locked(stats_path + '.lock'):
+        stats, applied = _read_stats(stats_path)
+        # 이전 compact 가 중간에 멈췄다면 남은 파일부터 처리
+        work_files = _work_files(log_path)
+        if not work_files and os.path.exists(log_path):
+            batch = '%016x-%x' % (time.time_ns(), os.getpid())
+            work_path = f'{log_path}.{batch}{WORK_SUFFIX}'
+            with _locked(log_path + '.lock'):
+                os.replace(log_path, work_path)
+            work_files = [(batch, work_path)]
+
+        count = 0
+        for batch, work_path in work_files:
+            if batch != applied:
+                count += _apply_log(stats, work_path)
+                _write_stats(stats_path, stats, batch)
+                applied = batch
+            os.remove(work_path)
+        return count
+
+
+def _apply_log(stats, work_path):
+    """작업 파일의 이벤트를 집계에 반영 (반영한 이벤트 수 반환)"""
+    count = 0
+    with open(work_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # 비정상 종료로 잘린 마지막 줄은 건너뜀
+                continue
+            apply_event(stats, event)
+            count += 1
+    return count
+
+
+def _write_stats(stats_path, stats, batch):
+    """집계와 묶음 번호를 원자적으로 저장 (임시 파일 이름은 프로세스별)"""
+    tmp_path = f'{stats_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'batch': batch, 'users': stats}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, stats_path)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'compact':
+        print(__doc__)
+        sys.exit(1)
+    instance_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+    log_file = sys.argv[2] if len(sys.argv) > 2 else os.path.join(instance_dir, 'attempts.ndjson')
+    stats_file = sys.argv[3] if len(sys.argv) > 3 else os.path.join(instance_dir, 'attempt_stats.json')
+    processed = compact(log_file, stats_file)
+    print(f"{processed}건의 시도를 {stats_file} 에 집계했습니다.")
@@ -0,0 +1,136 @@
+"""발음 음성 파일 디스크 캐시 (내용 주소 방식, 전체 바이트 크기로 제한되는 LRU)
+
+(텍스트, 언어, 음성/속도, 형식)의 해시를 파일 이름으로 써서 같은 발음은 한 번만
+합성한다. 파일은 임시 파일에 쓴 뒤 os.replace 로 바꿔 넣어 다른 워커가 반쯤 쓰인
+파일을 읽지 않게 한다. 어떤 파일이 있는지와 크기/사용 순서는 메모리 색인에 두어
+적중 확인에 디스크를 뒤지지 않고, 합이 max_bytes 를 넘으면 오래 안 쓴 파일부터 지운다.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def audio_key(text, lang='en', voice='', slow=False, fmt='mp3'):
+    """발음 1개의 캐시 키 (같은 입력이면 프로세스가 달라도 같은 값)"""
+    payload = json.dumps([text, lang, voice, bool(slow), fmt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """키 → 음성 파일 경로 (directory/키 앞 2글자/키.형식)"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # 키 → (파일 경로, 크기), 오래 안 쓴 것이 앞
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted_count = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """이미 있는 파일을 수정 시각(=마지막 사용 시각) 순서로 색인에 넣음"""
+        found = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name.split('.', 1)[0], path, st.st_size))
+        for _, key, path, size in sorted(found):
+            self._entries[key] = (path, size)
+            self._bytes += size
+        self._evict()
+
+    def path_for(self, key, fmt='mp3'):
+        return os.path.join(self.directory, key[:2], f'{key}.{fmt}')
+
+    def get(self, key, fmt='mp3'):
+        """캐시된 파일 경로 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            # 다른 워커가 만든 파일이면 색인에 추가
+            path = self.path_for(key, fmt)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                self.misses += 1
+                return None
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = (path, size)
+                    self._bytes += size
+            entry = (path, size)
+        try:
+            # 사용 순서를 파일에도 남겨서 재시작 후에도 LRU 순서 유지
+            os.utime(entry[0])
+        except FileNotFoundError:
+            # 다른 워커가 지운 파일
+            self._discard(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, data, fmt='mp3'):
+        """음성 바이트 저장 후 파일 경로 반환"""
+        path = self.path_for(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (path, len(data))
+            self._bytes += len(data)
+        self._evict()
+        return path
+
+    def _discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def _evict(self):
+        """max_bytes 를 넘으면 오래 안 쓴 파일부터 삭제 (가장 최근 1개는 남김)"""
+        while True:
+            with self._lock:
+                if self._bytes <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                _, (path, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+                self.evicted_count += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evicted': self.evicted_count
+            }
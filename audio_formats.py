@@ -0,0 +1,101 @@
+"""발음 음성 형식 변환 (ffmpeg 가 있으면 작은 형식으로 한 번만 변환해서 캐시)
+
+    opus      Ogg Opus 24kbps 모노 (가장 작음, audio/ogg 를 받는 브라우저만)
+    mp3-low   MP3 32kbps 모노 22kHz (모든 브라우저)
+
+변환은 캐시를 채울 때 한 번만 하고, 요청을 처리할 때는 캐시된 파일을 그대로 보낸다.
+ffmpeg 가 없거나 그 형식의 인코더가 없는 빌드면 그 형식은 고르지 않는다. 인코더는 처음
+한 번만 확인하고, 변환이 실패한 형식도 그 뒤로는 고르지 않는다.
+"""
+import shutil
+import subprocess
+
+# 형식 → Content-Type
+MIMETYPES = {
+    'mp3': 'audio/mpeg',
+    'wav': 'audio/wav',
+    'opus': 'audio/ogg',
+    'mp3-low': 'audio/mpeg',
+}
+
+# 변환 가능한 형식 → ffmpeg 인코딩 인자 (작은 것부터)
+COMPACT_FORMATS = {
+    'opus': ['-c:a', 'libopus', '-b:a', '24k', '-ac', '1', '-f', 'ogg'],
+    'mp3-low': ['-c:a', 'libmp3lame', '-b:a', '32k', '-ac', '1', '-ar', '22050', '-f', 'mp3'],
+}
+
+FFMPEG = shutil.which('ffmpeg')
+
+
+class TranscodeError(RuntimeError):
+    """ffmpeg 변환 실패 (호출하는 쪽에서 원본 형식으로 대신 보냄)"""
+
+
+def _encoders():
+    """ffmpeg 빌드에 들어 있는 오디오 인코더 이름 (ffmpeg 가 없거나 확인에 실패하면 빈 집합)"""
+    if FFMPEG is None:
+        return frozenset()
+    try:
+        result = subprocess.run([FFMPEG, '-hide_banner', '-encoders'],
+                                capture_output=True, check=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    encoders = set()
+    for line in result.stdout.decode('utf-8', 'replace').splitlines():
+        # " A..... libopus   libopus Opus" 형식의 줄에서 두 번째 칸
+        parts = line.split()
+        if len(parts) > 1 and parts[0].startswith('A') and parts[1] != '=':
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+ENCODERS = _encoders()
+
+# 변환이 실패한 형식 (이후에는 고르지 않음)
+_failed_formats = set()
+
+
+def available_formats(source_fmt):
+    """source_fmt 음성을 보낼 수 있는 형식 (작은 것부터, 마지막이 원본)"""
+    formats = [fmt for fmt, args in COMPACT_FORMATS.items()
+               if args[args.index('-c:a') + 1] in ENCODERS and fmt not in _failed_formats]
+    return formats + [source_fmt]
+
+
+def transcode(data, fmt, timeout=30):
+    """음성 바이트를 fmt 형식으로 변환 (실패하면 TranscodeError)"""
+    if FFMPEG is None:
+        raise TranscodeError('ffmpeg 를 찾을 수 없습니다.')
+    try:
+        result = subprocess.run([FFMPEG, '-hide_banner', '-loglevel', 'error', '-i', 'pipe:0',
+                                 *COMPACT_FORMATS[fmt], 'pipe:1'],
+                                input=data, capture_output=True, check=True, timeout=timeout)
+    except subprocess.CalledProcessError as e:
+        # 이 ffmpeg 로는 만들 수 없는 형식이므로 다음부터 고르지 않음
+        _failed_formats.add(fmt)
+        message = e.stderr.decode('utf-8', 'replace').strip()
+        raise TranscodeError(f'{fmt} 변환 실패: {message or e}') from e
+    except (OSError, subprocess.SubprocessError) as e:
+        raise TranscodeError(f'{fmt} 변환 실패: {e}') from e
+    if not result.stdout:
+        _failed_formats.add(fmt)
+        raise TranscodeError(f'{fmt} 변환 결과가 비어 있습니다.')
+    return result.stdout
+
+
+def negotiate(accept, source_fmt, requested=None):
+    """보낼 형식 선택 (requested 가 가능하면 그것, 아니면 Accept 가 허용하는 가장 작은 형식)
+
+    audio/mpeg 는 모든 브라우저가 재생하므로 */* 로도 허용하지만, Ogg Opus 는 재생하지
+    못하는 브라우저가 있어서 Accept 에 audio/ogg 가 직접 적혀 있을 때만 고른다.
+    accept 는 werkzeug 의 MIMEAccept (request.accept_mimetypes).
+    """
+    formats = available_formats(source_fmt)
+    if requested in formats:
+        return requested
+    explicit = {value for value, quality in accept if quality > 0}
+    for fmt in formats[:-1]:
+        mimetype = MIMETYPES[fmt]
+        if mimetype in explicit or (mimetype == 'audio/mpeg' and (not accept or accept[mimetype])):
+            return fmt
+    return source_fmt
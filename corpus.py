@@ -0,0 +1,722 @@
+"""모드별 단어 목록(코퍼스) 레지스트리
+
+각 모드의 JSON 파일을 한 번만 읽어 불변 스냅샷으로 보관하고, 파일의 mtime/크기가
+바뀌면 새 스냅샷으로 통째로 교체한다. 동시에 여러 요청이 다시 읽기를 시도해도
+파싱은 한 번만 일어난다.
+
+단어 추가/삭제는 파일을 다시 쓰지 않고 변경 저널(corpus_journal)에 한 줄씩 기록한 뒤,
+기본 스냅샷 위에 추가된 단어와 삭제 표시를 얹은 새 스냅샷으로 교체한다. 단어 ID 는
+압축 전까지 바뀌지 않는다. 쌓인 변경은 주기적으로 JSON 파일에 합친다(compact).
+"""
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from corpus_bin import BinaryCorpus, binary_path, compile_words, read_source_signature
+from corpus_journal import CorpusJournal
+from file_cache import file_signature
+from groups import GroupLayout, LayoutStore, word_keys
+
+# category 필드가 없는 단어의 카테고리
+DEFAULT_CATEGORY = '기타'
+
+
+class CorpusEditError(RuntimeError):
+    """저널에 쓴 변경이 코퍼스 스냅샷에 반영되지 않음"""
+
+
+class FrozenWord(dict):
+    """수정할 수 없는 단어 dict (jsonify 로 그대로 직렬화 가능)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('코퍼스 단어는 수정할 수 없습니다. 복사본을 사용하세요.')
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict(self)
+
+
+class OverlayWords(Sequence):
+    """기본 단어 목록 뒤에 추가된 단어를 이어 붙인 목록
+
+    추가된 단어 목록(added)은 최신 상태와 공유하고 count 로 이 스냅샷이 보는 길이만
+    정하므로, 단어를 추가할 때마다 목록을 복사하지 않는다.
+    """
+
+    def __init__(self, base, added, count):
+        self.base = base
+        self._added = added
+        self._count = count
+        self._base_len = len(base)
+
+    def __len__(self):
+        return self._base_len + self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if 0 <= index < self._base_len:
+            return self.base[index]
+        if not 0 <= index - self._base_len < self._count:
+            raise IndexError('corpus index out of range')
+        return self._added[index - self._base_len]
+
+    def field(self, index, name):
+        """단어 1개의 필드 1개 (없으면 None)"""
+        if index < self._base_len and hasattr(self.base, 'field'):
+            return self.base.field(index, name)
+        return self[index].get(name)
+
+    def field_values(self, name):
+        """모든 단어의 필드 1개 값 (없으면 '')"""
+        if hasattr(self.base, 'field_values'):
+            values = self.base.field_values(name)
+        else:
+            values = [w.get(name) or '' for w in self.base]
+        values.extend(self._added[i].get(name) or '' for i in range(self._count))
+        return values
+
+
+class OverlayKeys(Sequence):
+    """원래 스냅샷의 키 뒤에 추가된 단어의 키를 이어 붙인 목록 (삭제된 단어는 None)"""
+
+    def __init__(self, base, added, deleted):
+        self.base = base
+        self.added = added
+        self.deleted = deleted
+        self._base_len = len(base)
+
+    def __len__(self):
+        return self._base_len + len(self.added)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index in self.deleted:
+            return None
+        if 0 <= index < self._base_len:
+            return self.base[index]
+        return self.added[index - self._base_len]
+
+
+class CategoryIds:
+    """원래 스냅샷의 카테고리 ID 에서 삭제된 ID 를 건너뛰고 추가된 ID 를 붙인 목록 (오름차순)
+
+    원래 ID 배열을 복사하지 않으므로 큰 카테고리에 단어 1개를 추가/삭제해도 변경 수에만
+    비례하는 비용이 든다.
+    """
+
+    def __init__(self, base, removed, removed_count, added):
+        self.base = base
+        # 원래 스냅샷에는 있고 이 스냅샷에서 삭제된 ID (다른 카테고리 것도 들어 있음)
+        self.removed = removed
+        self.added = added
+        self._len = len(base) - removed_count + len(added)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return self.from_id(0)
+
+    def from_id(self, start):
+        """start 이상인 ID 를 순서대로"""
+        for word_id in ids_from(self.base, start):
+            if word_id not in self.removed:
+                yield word_id
+        yield from self.added[bisect_left(self.added, start):]
+
+
+def ids_from(ids, start):
+    """정렬된 카테고리 ID 목록에서 start 이상인 ID 를 순서대로"""
+    if isinstance(ids, CategoryIds):
+        return ids.from_id(start)
+    return (ids[i] for i in range(bisect_left(ids, start), len(ids)))
+
+
+class Corpus:
+    """한 모드의 단어 목록 스냅샷 (불변)
+
+    deleted 는 삭제된 단어 ID 집합이다. 예전 세션이 단어를 찾을 수 있도록 삭제된 단어도
+    words 에는 남아 있고, 색인/배치/검색에서만 빠진다. origin 이 있으면 그 스냅샷 위에
+    추가/삭제를 얹은 스냅샷이고, 키/색인/배치는 origin 의 것에 바뀐 부분만 더한다.
+    parent 가 있으면 공유 코퍼스(parent) 위에 개인 단어장을 얹은 스냅샷이다.
+    """
+
+    def __init__(self, name, path, words, signature, load_seconds, layout_store=None,
+                 deleted=frozenset(), version=None, categories=None, parent=None, origin=None):
+        self.name = name
+        self.parent = parent
+        self._origin = origin
+        self.path = path
+        self.words = words
+        self.deleted = deleted
+        self.signature = signature
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.size_bytes = signature[1] if signature else 0
+        # 파일 mtime/크기에서 만든 버전 (프로세스가 달라도 같은 파일이면 같은 값)
+        self.base_version = '%x-%x' % signature if signature else 'default'
+        # 변경이 얹힌 스냅샷은 "파일 버전.적용한 저널 항목 수"
+        self.version = version or self.base_version
+        self._layout_store = layout_store
+        self._keys = None
+        self._word_index = None
+        self._layouts = {}
+        self._layout_lock = threading.Lock()
+        # 카테고리 → 단어 ID 목록 (스냅샷을 만들 때 한 번만 계산)
+        if categories is None:
+            categories = self._build_category_index()
+        self.categories = categories
+        self.category_names = sorted(self.categories)
+
+    def __len__(self):
+        """삭제되지 않은 단어 수"""
+        return len(self.words) - len(self.deleted)
+
+    @property
+    def keys(self):
+        """단어별 고유 키 목록 (묶음 배치 저장에 사용, 삭제된 단어는 None)"""
+        if self._keys is None:
+            if self._origin is not None:
+                # 추가된 단어의 키만 만들어서 원래 스냅샷의 키 뒤에 붙임
+                added = word_keys(self.words.field(i, 'word') or '' for i in self._added_ids())
+                self._keys = OverlayKeys(self._origin.keys, added, self.deleted)
+                return self._keys
+            if hasattr(self.words, 'field_values'):
+                # 바이너리 코퍼스는 word 필드만 읽음
+                strings = self.words.field_values('word')
+            else:
+                strings = [w.get('word', '') for w in self.words]
+            for word_id in self.deleted:
+                strings[word_id] = None
+            self._keys = word_keys(strings)
+        return self._keys
+
+    def ids_of(self, word):
+        """대소문자를 무시하고 word 와 같은 살아 있는 단어 ID 목록"""
+        if self._word_index is None:
+            if self._origin is not None:
+                # origin 이 있으면 추가된 단어만 색인
+                word_ids = self._added_ids()
+                strings = (self.words.field(i, 'word') or '' for i in word_ids)
+            elif hasattr(self.words, 'field_values'):
+                word_ids = range(len(self.words))
+                strings = self.words.field_values('word')
+            else:
+                word_ids = range(len(self.words))
+                strings = [w.get('word', '') for w in self.words]
+            index = {}
+            for word_id, word_text in zip(word_ids, strings):
+                if word_id not in self.deleted:
+                    index.setdefault(word_text.casefold(), []).append(word_id)
+            self._word_index = index
+        ids = self._word_index.get(word.casefold(), ())
+        if self._origin is None:
+            return ids
+        return [i for i in self._origin.ids_of(word) if i not in self.deleted] + list(ids)
+
+    def _added_ids(self):
+        """origin 위에 추가된 단어 ID"""
+        return range(len(self._origin.words), len(self.words))
+
+    def _category_of(self, word_id):
+        return self.field_value(word_id, 'category') or DEFAULT_CATEGORY
+
+    def field_value(self, word_id, name):
+        """단어 1개의 필드 1개 (바이너리 코퍼스는 그 필드만 디코딩, 없으면 None)"""
+        if hasattr(self.words, 'field'):
+            return self.words.field(word_id, name)
+        return self.words[word_id].get(name)
+
+    def word(self, word_id, fields=None):
+        """응답용 단어 dict (id 포함, fields 를 주면 그 필드만)"""
+        if fields is None:
+            return dict(self.words[word_id], id=word_id)
+        word = {'id': word_id}
+        for name in fields:
+            value = self.field_value(word_id, name)
+            if value is not None:
+                word[name] = value
+        return word
+
+    def _build_category_index(self):
+        if hasattr(self.words, 'field_values'):
+            values = self.words.field_values('category')
+        else:
+            values = [w.get('category') for w in self.words]
+        index = {}
+        for word_id, category in enumerate(values):
+            if word_id not in self.deleted:
+                index.setdefault(category or DEFAULT_CATEGORY, array('I')).append(word_id)
+        return index
+
+    def with_edits(self, added, added_count, deleted, version, personal=False):
+        """이 스냅샷에 추가/삭제를 얹은 새 스냅샷
+
+        단어 목록, 키, 색인, 카테고리, 묶음 배치는 이 스냅샷의 것을 공유하고 추가된 단어와
+        새로 삭제된 단어만 얹으므로 비용이 코퍼스 크기가 아니라 변경 수에 비례한다.
+        personal 이면 개인 단어장 스냅샷이다 (parent 가 이 스냅샷).
+        """
+        words = OverlayWords(self.words, added, added_count)
+        new_ids = range(len(self.words), len(words))
+        removed = deleted - self.deleted
+
+        def category_of(word_id):
+            return words.field(word_id, 'category') or DEFAULT_CATEGORY
+
+        added_by_category = {}
+        for word_id in new_ids:
+            if word_id not in deleted:
+                added_by_category.setdefault(category_of(word_id), array('I')).append(word_id)
+        removed_counts = {}
+        for word_id in removed:
+            if word_id < len(self.words):
+                category = category_of(word_id)
+                removed_counts[category] = removed_counts.get(category, 0) + 1
+        categories = dict(self.categories)
+        for category in removed_counts.keys() | added_by_category.keys():
+            ids = CategoryIds(self.categories.get(category, ()), removed,
+                              removed_counts.get(category, 0), added_by_category.get(category, ()))
+            if ids:
+                categories[category] = ids
+            else:
+                categories.pop(category, None)
+        return Corpus(self.name, self.path, words, self.signature, 0.0,
+                      layout_store=None if personal else self._layout_store, deleted=deleted,
+                      version=version, categories=categories, parent=self if personal else None,
+                      origin=self)
+
+    def find(self, start=0, category=None, prefix=None):
+        """조건에 맞는 단어 ID 를 start 부터 순서대로 (prefix 는 대소문자 무시)"""
+        start = max(start, 0)
+        if category is not None:
+            # 카테고리 색인에서 start 이후 ID 만 순회
+            candidates = ids_from(self.categories.get(category, ()), start)
+        elif self.deleted:
+            candidates = (i for i in range(start, len(self.words)) if i not in self.deleted)
+        else:
+            candidates = range(start, len(self.words))
+        if not prefix:
+            yield from candidates
+            return
+        keys = self.keys
+        prefix = prefix.casefold()
+        for word_id in candidates:
+            if keys[word_id].startswith(prefix):
+                yield word_id
+
+    def layout(self, group_size, category=None):
+        """group_size 별 묶음 배치 (카테고리를 주면 그 카테고리 단어만, 스냅샷별로 한 번만 계산)"""
+        if category not in self.categories:
+            category = None
+        key = (group_size, category)
+        layout = self._layouts.get(key)
+        if layout is None:
+            # 카테고리 배치는 전체 배치의 순서를 그대로 따름
+            base = None
+            if category is not None and self._origin is None:
+                base = self.layout(group_size)
+            with self._layout_lock:
+                layout = self._layouts.get(key)
+                if layout is None:
+                    if self._origin is not None:
+                        layout = self._overlay_layout(group_size, category)
+                    elif base is None:
+                        layout = self._build_layout(group_size)
+                    else:
+                        layout = base.subset(self.categories[category], category)
+                    self._layouts[key] = layout
+        return layout
+
+    def _overlay_layout(self, group_size, category):
+        """origin 의 배치에서 삭제된 단어를 빼고 추가된 단어를 뒤에 붙임 (저장하지 않음)"""
+        extra = self._added_ids()
+        if category is None:
+            return self._origin.layout(group_size).overlay(self.deleted, extra)
+        extra = [i for i in extra if self._category_of(i) == category]
+        if category in self._origin.categories:
+            base = self._origin.layout(group_size, category)
+        else:
+            base = GroupLayout([], group_size, category=category)
+        return base.overlay(self.deleted, extra)
+
+    def save_layouts(self, group_sizes):
+        """group_sizes 별 전체 배치 저장 (압축 직전에 호출해서 압축한 파일에서도 묶음이 이어지게)"""
+        if self._layout_store is None:
+            return
+        for group_size in sorted(group_sizes):
+            self._layout_store.save(self.name, group_size,
+                                    self.layout(group_size).assignment(self.keys))
+
+    def layout_sizes(self):
+        """지금까지 계산한 전체 배치의 묶음 크기"""
+        return {size for size, category in list(self._layouts) if category is None}
+
+    def _build_layout(self, group_size):
+        """저장된 배치가 있으면 바뀐 단어만 반영하고, 없으면 새로 섞어서 저장"""
+        if self._layout_store is None:
+            return GroupLayout.shuffled(len(self.words), group_size, exclude=self.deleted)
+        assignment = self._layout_store.load(self.name, group_size)
+        if assignment is None:
+            layout = GroupLayout.shuffled(len(self.words), group_size, exclude=self.deleted)
+        else:
+            layout = GroupLayout.reconcile(self.keys, assignment, group_size)
+            if not layout.changed_groups and len(layout) == len(assignment):
+                return layout
+        self._layout_store.save(self.name, group_size, layout.assignment(self.keys))
+        return layout
+
+    def stats(self):
+        words = self.words.base if isinstance(self.words, OverlayWords) else self.words
+        return {
+            'version': self.version,
+            'storage': 'mmap' if isinstance(words, BinaryCorpus) else 'memory',
+            'words': len(self),
+            'added': len(self.words) - len(words),
+            'deleted': len(self.deleted),
+            'categories': len(self.categories),
+            'size_bytes': self.size_bytes,
+            'load_ms': round(self.load_seconds * 1000, 2),
+            'loaded_at': self.loaded_at
+        }
+
+
+class CorpusEdits:
+    """코퍼스 파일 위에 쌓인 추가/삭제 (모드별 최신 상태, 레지스트리 잠금 안에서만 변경)"""
+
+    def __init__(self, base):
+        self.base = base
+        self.added = []
+        self.deleted = set()
+        # 적용한 저널 항목 수 (스냅샷 버전에 사용)
+        self.count = 0
+        # 저널에서 어디까지 읽었는지
+        self.generation = None
+        self.offset = 0
+        self._snapshot = base
+        # 대소문자를 무시한 단어 → 살아 있는 단어 ID 목록 (추가/삭제/중복 확인을 O(1) 로)
+        self.index = {}
+        if hasattr(base.words, 'field_values'):
+            strings = base.words.field_values('word')
+        else:
+            strings = [w.get('word', '') for w in base.words]
+        for word_id, word in enumerate(strings):
+            self.index.setdefault(word.casefold(), []).append(word_id)
+
+    def apply(self, entry):
+        """저널 항목 1개 적용 (이미 있는 단어 추가, 없는 단어 삭제는 아무것도 바꾸지 않음)"""
+        self.count += 1
+        word = entry.get('word')
+        if entry.get('op') == 'add' and isinstance(word, dict) and word.get('word'):
+            key = word['word'].casefold()
+            if key not in self.index:
+                self.index[key] = [len(self.base.words) + len(self.added)]
+                self.added.append(FrozenWord(word))
+        elif entry.get('op') == 'del' and isinstance(word, str):
+            self.deleted.update(self.index.pop(word.casefold(), ()))
+
+    def snapshot(self):
+        """현재 상태의 불변 스냅샷 (변경이 없으면 기본 스냅샷)"""
+        if not self.count:
+            return self.base
+        version = '%s.%d' % (self.base.version, self.count)
+        if self._snapshot.version != version:
+            self._snapshot = self.base.with_edits(self.added, len(self.added),
+                                                  frozenset(self.deleted), version)
+        return self._snapshot
+
+
+class CorpusRegistry:
+    """모드 이름 → Corpus 스냅샷 (파일이나 변경 저널이 바뀌면 자동으로 교체)"""
+
+    KEEP_RECENT = 8
+
+    def __init__(self, layout_dir=None, binary_dir=None, journal_dir=None, compact_interval=300):
+        # 묶음 배치를 저장할 폴더 (없으면 매번 고정 시드로 섞음)
+        self._layout_store = LayoutStore(layout_dir) if layout_dir else None
+        # 컴파일된 바이너리 코퍼스 폴더 (있으면 JSON 대신 mmap 으로 읽음)
+        self._binary_dir = binary_dir
+        # 단어 추가/삭제 저널 폴더 (없으면 add_word/delete_word 사용 불가)
+        self._journal_dir = journal_dir
+        # 저널을 코퍼스 파일에 합치는 간격 (초, 0 이면 compact() 를 직접 호출)
+        self.compact_interval = compact_interval
+        self._paths = {}
+        self._defaults = {}
+        self._corpora = {}
+        self._edits = {}
+        self._journals = {}
+        self._journal_signatures = {}
+        self._locks = {}
+        self._bad_signatures = {}
+        # 세션이 예전 버전의 단어 ID 를 쓸 수 있도록 최근 스냅샷 몇 개를 보관
+        self._recent = {}
+        self._compactor = None
+        self._compactor_lock = threading.Lock()
+        self.reload_count = 0
+        self.compact_count = 0
+        self.rebase_count = 0
+
+    def register(self, name, path, default=()):
+        """모드 등록 (파일이 없거나 읽을 수 없으면 default 사용)"""
+        self._paths[name] = path
+        self._defaults[name] = tuple(FrozenWord(w) for w in default)
+        self._locks[name] = threading.RLock()
+        self._recent[name] = OrderedDict()
+        if self._journal_dir:
+            self._journals[name] = CorpusJournal(os.path.join(self._journal_dir, f'{name}.ndjson'))
+
+    def names(self):
+        return list(self._paths)
+
+    def snapshot(self, name, version):
+        """특정 버전의 스냅샷 (이미 버려졌으면 None)"""
+        corpus = self.get(name)
+        if corpus.version == version:
+            return corpus
+        return self._recent[name].get(version)
+
+    def _is_current(self, name, corpus):
+        signature = file_signature(self._paths[name])
+        if signature != corpus.signature and signature != self._bad_signatures.get(name):
+            return False
+        journal = self._journals.get(name)
+        return journal is None or file_signature(journal.path) == self._journal_signatures.get(name)
+
+    def get(self, name):
+        """최신 Corpus 반환 (파일이나 저널이 바뀐 경우에만 다시 읽음)"""
+        corpus = self._corpora.get(name)
+        if corpus is not None and self._is_current(name, corpus):
+            return corpus
+        with self._locks[name]:
+            # 다른 요청이 이미 다시 읽었으면 그 결과 사용
+            corpus = self._corpora.get(name)
+            if corpus is not None and self._is_current(name, corpus):
+                return corpus
+            return self._refresh(name)
+
+    def _refresh(self, name):
+        """코퍼스 파일과 저널을 최신으로 반영한 스냅샷 (잠금 안에서 호출)"""
+        edits = self._edits.get(name)
+        signature = file_signature(self._paths[name])
+        if edits is None or (signature != edits.base.signature
+                             and signature != self._bad_signatures.get(name)):
+            base = self._load(name, signature)
+            if base is not None:
+                self._bad_signatures.pop(name, None)
+                self.reload_count += 1
+            else:
+                self._bad_signatures[name] = signature
+                if edits is None:
+                    base = Corpus(name, self._paths[name], self._defaults[name], None, 0.0)
+            if base is not None:
+                # 파일이 바뀌면 저널을 처음부터 다시 적용
+                self._edits[name] = CorpusEdits(base)
+        self._catch_up(name)
+
+        corpus = self._edits[name].snapshot()
+        if self._corpora.get(name) is not corpus:
+            self._corpora[name] = corpus
+            recent = self._recent[name]
+            recent[corpus.version] = corpus
+            while len(recent) > self.KEEP_RECENT:
+                recent.popitem(last=False)
+        return corpus
+
+    def _catch_up(self, name):
+        """저널에 새로 쓰인 항목 적용 (다른 워커가 쓴 항목 포함)"""
+        journal = self._journals.get(name)
+        if journal is None:
+            return
+        # 읽는 도중에 추가되는 항목은 다음 get() 에서 다시 확인하도록 읽기 전에 기록
+        self._journal_signatures[name] = file_signature(journal.path)
+        edits = self._edits[name]
+        header, entries, offset, reset = journal.read(edits.generation, edits.offset)
+        if entries and header.get('base') != edits.base.base_version:
+            # 다른 파일 버전을 기준으로 쓴 항목: 압축 중이면 끝날 때까지 기다리고, 파일만 바뀐
+            # 채로 남았으면 항목을 현재 파일 기준으로 옮긴 뒤 다시 읽음
+            with journal.locked():
+                self._rebase(name)
+            self._journal_signatures[name] = file_signature(journal.path)
+            header, entries, offset, reset = journal.read(edits.generation, edits.offset)
+        if reset and edits.count:
+            # 압축으로 저널이 새 세대가 됨
+            edits = self._edits[name] = CorpusEdits(edits.base)
+        if header.get('base') == edits.base.base_version:
+            for entry in entries:
+                edits.apply(entry)
+        # 그래도 다른 파일 버전 기준이면(파일이 또 바뀜) 다음 get() 에서 다시 읽은 뒤 적용
+        edits.generation = header.get('generation')
+        edits.offset = offset
+
+    def _rebase(self, name):
+        """저널이 현재 파일과 다른 버전을 기준으로 쓰였으면 현재 파일 기준의 새 세대로 다시 씀
+
+        코퍼스 파일을 직접 고쳤거나 배포로 바뀌었거나, 압축이 파일을 바꾼 뒤 저널을 비우기
+        전에 멈춘 경우다. 항목은 단어 키로 다시 적용되므로 이미 파일에 들어간 추가나 이미
+        없는 단어의 삭제는 아무것도 바꾸지 않는다. 저널 잠금 안에서 호출하고, 다시 썼으면
+        True 를 반환한다.
+        """
+        journal = self._journals[name]
+        base = self._edits[name].base
+        if file_signature(self._paths[name]) != base.signature:
+            # 읽은 뒤에 파일이 또 바뀜 (다른 워커의 압축 등): 다시 읽은 뒤에 확인
+            return False
+        header, entries, _, _ = journal.read()
+        if header.get('base') in (None, base.base_version):
+            return False
+        journal.reset(base.base_version, entries)
+        self.rebase_count += 1
+        return True
+
+    def _refresh_for_write(self, name):
+        """최신 상태를 반영하고 저널 헤더를 현재 파일 버전에 맞춤 (두 잠금 안에서 호출)"""
+        corpus = self._refresh(name)
+        if self._rebase(name):
+            corpus = self._refresh(name)
+        return corpus
+
+    def add_word(self, name, word):
+        """단어 추가 (새 단어 ID 반환, 대소문자를 무시하고 이미 있는 단어면 None)"""
+        journal = self._journals[name]
+        key = word['word'].casefold()
+        with self._locks[name], journal.locked():
+            # 다른 워커의 변경까지 반영한 뒤 확인하므로 같은 단어가 두 번 추가되지 않음
+            self._refresh_for_write(name)
+            if key in self._edits[name].index:
+                return None
+            journal.append({'op': 'add', 'word': word}, self._edits[name].base.base_version)
+            self._refresh(name)
+            ids = self._edits[name].index.get(key)
+        if not ids:
+            raise CorpusEditError(f"{name} 코퍼스에 '{word['word']}' 추가가 반영되지 않았습니다.")
+        self._ensure_compactor()
+        return ids[0]
+
+    def delete_word(self, name, word):
+        """단어 삭제 (대소문자 무시, 삭제한 단어 수 반환)"""
+        journal = self._journals[name]
+        key = word.casefold()
+        with self._locks[name], journal.locked():
+            self._refresh_for_write(name)
+            count = len(self._edits[name].index.get(key, ()))
+            if count:
+                journal.append({'op': 'del', 'word': word}, self._edits[name].base.base_version)
+                self._refresh(name)
+        if count:
+            self._ensure_compactor()
+        return count
+
+    def pending_edits(self, name):
+        edits = self._edits.get(name)
+        return edits.count if edits else 0
+
+    def compact(self, name):
+        """저널의 변경을 코퍼스 JSON 파일에 합치고 저널 비우기 (합친 항목 수 반환)
+
+        압축 후에는 단어 ID 가 다시 0 부터 빈틈없이 매겨진다. 예전 ID 를 쓰는 세션은
+        보관된 이전 스냅샷으로 계속 동작한다.
+        """
+        journal = self._journals.get(name)
+        if journal is None:
+            return 0
+        with self._locks[name], journal.locked():
+            # 파일이 바뀐 채로 남은 저널도 여기서 현재 파일 기준으로 옮겨서 합침
+            corpus = self._refresh_for_write(name)
+            edits = self._edits[name]
+            count = edits.count
+            if not count:
+                return 0
+            words = [dict(corpus.words[i]) for i in range(len(corpus.words))
+                     if i not in corpus.deleted]
+            # 변경 중에는 배치를 저장하지 않으므로, 새 파일이 지금 묶음을 이어받도록 여기서 저장
+            corpus.save_layouts(corpus.layout_sizes() | edits.base.layout_sizes())
+            path = self._paths[name]
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(words, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+            # 저널을 새 파일 기준의 빈 세대로 바꾼 뒤 새 파일을 읽음 (바이너리도 다시 컴파일)
+            journal.reset('%x-%x' % file_signature(path))
+            self._refresh(name)
+            self.compact_count += 1
+            return count
+
+    def compact_all(self):
+        for name in self.names():
+            if self.pending_edits(name):
+                try:
+                    self.compact(name)
+                except (OSError, ValueError) as e:
+                    print(f"{name} 코퍼스 압축 오류: {e}")
+
+    def _ensure_compactor(self):
+        if self._compactor is not None or not self.compact_interval:
+            return
+        with self._compactor_lock:
+            if self._compactor is None:
+                self._compactor = threading.Thread(target=self._run_compactor,
+                                                   name='corpus-compactor', daemon=True)
+                self._compactor.start()
+
+    def _run_compactor(self):
+        while True:
+            time.sleep(self.compact_interval)
+            self.compact_all()
+
+    def _load(self, name, signature):
+        """코퍼스 읽기 (최신 바이너리가 있으면 mmap, 없으면 JSON 파싱, 실패하면 None)"""
+        if signature is None:
+            return None
+        path = self._paths[name]
+        bin_path = binary_path(path, self._binary_dir) if self._binary_dir else None
+        started = time.perf_counter()
+
+        if bin_path and read_source_signature(bin_path) == signature:
+            try:
+                words = BinaryCorpus(bin_path, word_factory=FrozenWord)
+                return self._corpus(name, words, signature, started)
+            except (OSError, ValueError) as e:
+                print(f"{name} 바이너리 코퍼스 오류: {e}")
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"{name} 단어 로드 오류: {e}")
+            return None
+
+        if bin_path:
+            # 다음부터(다른 워커 포함) 파싱 없이 열 수 있도록 바이너리로 저장
+            try:
+                compile_words(data, bin_path, signature)
+                words = BinaryCorpus(bin_path, word_factory=FrozenWord)
+                return self._corpus(name, words, signature, started)
+            except (OSError, ValueError) as e:
+                print(f"{name} 바이너리 코퍼스 저장 오류: {e}")
+
+        words = tuple(FrozenWord(w) for w in data)
+        return self._corpus(name, words, signature, started)
+
+    def _corpus(self, name, words, signature, started):
+        return Corpus(name, self._paths[name], words, signature, time.perf_counter() - started,
+                      layout_store=self._layout_store)
+
+    def stats(self):
+        stats = {}
+        for name, corpus in self._corpora.items():
+            stats[name] = corpus.stats()
+            stats[name]['pending_edits'] = self.pending_edits(name)
+        return stats
@@ -0,0 +1,185 @@
+"""코퍼스 바이너리 포맷 (메모리 맵으로 필요한 단어만 읽기)
+
+JSON 코퍼스를 "오프셋 테이블 + UTF-8 문자열 힙" 형태의 파일로 컴파일한다.
+앱은 이 파일을 mmap 으로 열어서 요청된 묶음의 단어만 디코딩하므로, 코퍼스가
+커져도 시작 시간과 메모리가 거의 늘지 않고 여러 워커가 같은 페이지를 공유한다.
+
+파일 구조 (little-endian):
+    헤더      magic 'ESBW', 포맷 버전, 필드 수, 단어 수, 원본 JSON (mtime_ns, size),
+              테이블 시작 위치, 힙 시작 위치
+    필드 이름  (u16 길이 + UTF-8) × 필드 수
+    테이블    단어마다 필드별 (u32 힙 오프셋, u32 길이), 필드가 없으면 길이 0xFFFFFFFF
+    힙        UTF-8 문자열
+
+사용법:
+    python corpus_bin.py build [JSON 폴더] [출력 폴더]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Sequence
+
+from file_cache import file_signature
+
+MAGIC = b'ESBW'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIQQQQ')
+MISSING = 0xFFFFFFFF
+
+# 기본 필드 순서 (그 외 필드는 뒤에 추가)
+DEFAULT_FIELDS = ('word', 'meaning', 'example', 'example_kr', 'past_tense', 'category')
+
+
+def binary_path(json_path, out_dir):
+    """JSON 코퍼스에 대응하는 바이너리 파일 경로"""
+    name = os.path.splitext(os.path.basename(json_path))[0]
+    return os.path.join(out_dir, name + '.bin')
+
+
+def compile_words(words, out_path, source_signature=(0, 0)):
+    """단어 목록을 바이너리 파일로 저장 (원자적으로 교체)"""
+    fields = list(DEFAULT_FIELDS)
+    for w in words:
+        for key in w:
+            if key not in fields:
+                fields.append(key)
+
+    heap = bytearray()
+    table = bytearray()
+    pack_pair = struct.Struct('<II').pack
+    for w in words:
+        for field in fields:
+            value = w.get(field)
+            if value is None:
+                table += pack_pair(0, MISSING)
+                continue
+            data = str(value).encode('utf-8')
+            table += pack_pair(len(heap), len(data))
+            heap += data
+
+    names = bytearray()
+    for field in fields:
+        encoded = field.encode('utf-8')
+        names += struct.pack('<H', len(encoded)) + encoded
+
+    table_offset = HEADER.size + len(names)
+    heap_offset = table_offset + len(table)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(fields), len(words),
+                         source_signature[0], source_signature[1], table_offset, heap_offset)
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    tmp_path = f'{out_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(names)
+        f.write(table)
+        f.write(heap)
+    # 다른 프로세스가 mmap 중인 이전 파일은 그대로 유효함
+    os.replace(tmp_path, out_path)
+
+
+def compile_json(json_path, out_path):
+    """JSON 코퍼스 파일을 바이너리로 컴파일 (단어 수 반환)"""
+    signature = file_signature(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        words = json.load(f)
+    compile_words(words, out_path, signature)
+    return len(words)
+
+
+def read_source_signature(path):
+    """바이너리 파일에 기록된 원본 JSON 의 (mtime_ns, size), 읽을 수 없으면 None"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, _, _, mtime_ns, size, _, _ = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    return (mtime_ns, size)
+
+
+class BinaryCorpus(Sequence):
+    """mmap 으로 연 바이너리 코퍼스 (인덱스로 접근할 때만 해당 단어를 디코딩)"""
+
+    def __init__(self, path, word_factory=dict):
+        self.path = path
+        self._word_factory = word_factory
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, field_count, self._count, mtime_ns, size,
+         self._table_offset, self._heap_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path}: 지원하지 않는 코퍼스 파일입니다.')
+        self.source_signature = (mtime_ns, size)
+
+        fields = []
+        pos = HEADER.size
+        for _ in range(field_count):
+            (length,) = struct.unpack_from('<H', self._mm, pos)
+            pos += 2
+            fields.append(self._mm[pos:pos + length].decode('utf-8'))
+            pos += length
+        self.fields = tuple(fields)
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+        self._row = struct.Struct('<' + 'II' * field_count)
+        self._pair = struct.Struct('<II')
+
+    def __len__(self):
+        return self._count
+
+    def _string(self, offset, length):
+        start = self._heap_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('corpus index out of range')
+        row = self._row.unpack_from(self._mm, self._table_offset + index * self._row.size)
+        word = {}
+        for i, field in enumerate(self.fields):
+            length = row[2 * i + 1]
+            if length != MISSING:
+                word[field] = self._string(row[2 * i], length)
+        return self._word_factory(word)
+
+    def field(self, index, name):
+        """단어 1개의 필드 1개만 읽기 (없거나 모르는 필드면 None)"""
+        i = self._field_index.get(name)
+        if i is None:
+            return None
+        pos = self._table_offset + index * self._row.size + i * self._pair.size
+        offset, length = self._pair.unpack_from(self._mm, pos)
+        return None if length == MISSING else self._string(offset, length)
+
+    def field_values(self, name):
+        """모든 단어의 필드 1개 값 (다른 필드는 디코딩하지 않음)"""
+        return [self.field(i, name) or '' for i in range(self._count)]
+
+    def close(self):
+        self._mm.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print(__doc__)
+        sys.exit(1)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, 'static', 'data')
+    out_dir = sys.argv[3] if len(sys.argv) > 3 else os.path.join(base_dir, 'instance', 'corpus')
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith('.json'):
+            continue
+        json_path = os.path.join(data_dir, filename)
+        out_path = binary_path(json_path, out_dir)
+        count = compile_json(json_path, out_path)
+        print(f"{filename}: {count}개 단어 → {out_path} ({os.path.getsize(out_path):,} bytes)")
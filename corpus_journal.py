@@ -0,0 +1,103 @@
+"""코퍼스 변경 저널 (append-only NDJSON)
+
+단어 추가/삭제는 코퍼스 JSON 파일 전체를 다시 쓰지 않고 이 저널에 한 줄씩 추가한다.
+첫 줄은 세대(generation) 헤더이고, 압축(compact)할 때 저널을 비우면서 새 세대로
+바꾼다. 다른 워커는 세대가 바뀐 것을 보고 처음부터 다시 읽는다.
+
+    {"generation": "...", "base": "<저널이 기준으로 삼는 코퍼스 파일 버전>"}
+    {"op": "add", "word": {"word": "Zebra", "meaning": "얼룩말", ...}}
+    {"op": "del", "word": "zebra"}
+
+여러 프로세스가 같은 저널에 쓰므로 쓰기와 압축은 별도 잠금 파일(flock)로 직렬화한다.
+코퍼스 파일이 헤더의 base 와 다른 버전으로 바뀌면(직접 수정, 배포, 압축 도중 중단)
+남은 항목을 새 파일 기준의 새 세대로 다시 쓴다 (CorpusRegistry._rebase).
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+
+class CorpusJournal:
+    """모드 1개의 변경 저널 파일"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock_path = path + '.lock'
+        self._thread_lock = threading.RLock()
+        # 같은 스레드가 잠금을 다시 잡으면 flock 은 건너뜀 (새 파일 핸들로 flock 하면 교착)
+        self._depth = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    @contextmanager
+    def locked(self):
+        """저널 쓰기/압축 잠금 (같은 프로세스의 스레드 + 다른 프로세스)"""
+        with self._thread_lock:
+            if fcntl is None or self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            with open(self._lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self, generation=None, offset=0):
+        """generation 의 offset 이후 항목 읽기
+
+        (헤더, 항목 목록, 새 offset, 처음부터 다시 읽었는지) 를 반환한다. 세대가 바뀌었으면
+        헤더 다음부터 모두 읽는다. 쓰는 중인 마지막 줄(개행 없음)은 다음에 읽는다.
+        """
+        header = {'generation': generation, 'base': None}
+        try:
+            with open(self.path, 'rb') as f:
+                header_line = f.readline()
+                if not header_line.endswith(b'\n'):
+                    return header, [], offset, False
+                header = json.loads(header_line)
+                reset = header.get('generation') != generation
+                if reset:
+                    offset = len(header_line)
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return header, [], offset, False
+        end = data.rfind(b'\n') + 1
+        entries = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return header, entries, offset + end, reset
+
+    def append(self, entry, base_version=None):
+        """항목 1개 추가 (호출하는 쪽에서 locked() 를 잡고 있어야 함)"""
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self.reset(base_version)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def reset(self, base_version=None, entries=()):
+        """저널을 새 세대 헤더와 entries 만 남기고 비움 (호출하는 쪽에서 locked() 를 잡고 있어야 함)
+
+        파일을 교체하지 않고 제자리에서 비우므로 잠금/열린 핸들이 그대로 유효하다.
+        """
+        header = {'generation': '%x-%x' % (time.time_ns(), os.getpid()), 'base': base_version}
+        lines = [json.dumps(header, separators=(',', ':'))]
+        lines.extend(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) for entry in entries)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,66 @@
+"""파일 변경 시각(mtime)/크기로 검증하는 캐시
+
+파일을 매번 다시 파싱하지 않고, os.stat 결과가 달라졌을 때만 다시 읽는다.
+"""
+import os
+import threading
+
+
+def file_signature(path):
+    """(mtime_ns, size) 반환, 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class MtimeCache:
+    """loader(path) 결과를 파일이 바뀔 때까지 재사용하는 캐시"""
+
+    def __init__(self, path, loader, on_reload=None):
+        self.path = path
+        self._loader = loader
+        self._on_reload = on_reload
+        self._lock = threading.RLock()
+        self._signature = None
+        self._data = None
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self):
+        """캐시된 데이터 반환 (파일이 바뀌었으면 다시 읽기)"""
+        signature = file_signature(self.path)
+        if self._loaded and signature is not None and signature == self._signature:
+            self.hits += 1
+            return self._data
+        with self._lock:
+            signature = file_signature(self.path)
+            if self._loaded and signature is not None and signature == self._signature:
+                self.hits += 1
+                return self._data
+            self.misses += 1
+            data = self._loader(self.path)
+            reloaded = self._loaded
+            self._data = data
+            self._signature = signature
+            self._loaded = True
+        if reloaded and self._on_reload is not None:
+            self._on_reload()
+        return data
+
+    def set(self, data):
+        """직접 저장한 내용으로 캐시 갱신 (다시 읽지 않음)"""
+        with self._lock:
+            self._data = data
+            self._signature = file_signature(self.path)
+            self._loaded = True
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
@@ -0,0 +1,215 @@
+"""단어 묶음(그룹) 배치
+
+처음 한 번은 코퍼스를 고정 시드로 섞어서 묶음을 만들고, 그 배치(묶음별 단어 키 목록)를
+파일에 저장해 둔다. 이후 단어가 추가/삭제되면 저장된 배치를 기준으로 바뀐 묶음만
+고친다. 새 단어는 마지막 묶음 뒤에 붙고, 삭제된 단어는 자기 묶음에서만 빠지므로
+다른 묶음의 번호와 내용은 그대로 유지된다.
+"""
+import hashlib
+import json
+import os
+import random
+from array import array
+
+# 예전 create_word_groups 의 random.seed(42) 와 같은 순서를 만들기 위한 시드
+GROUP_SEED = 42
+
+# 단어 인덱스 → 묶음 번호 표에서 묶음이 없는 칸
+NO_GROUP = 0xFFFFFFFF
+
+
+def word_keys(word_strings):
+    """단어별 고유 키 (대소문자 무시, 같은 단어가 여러 번 있으면 #번호 추가, 삭제된 단어는 None)"""
+    keys = []
+    seen = {}
+    for word in word_strings:
+        if word is None:
+            keys.append(None)
+            continue
+        key = word.casefold()
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        keys.append(key if count == 0 else f'{key}#{count}')
+    return keys
+
+
+def ids_digest(word_ids):
+    """단어 인덱스 목록의 짧은 해시 (묶음 구성이 같으면 같은 값)"""
+    return hashlib.blake2b(array('I', word_ids).tobytes(), digest_size=8).hexdigest()
+
+
+class GroupLayout:
+    """단어 인덱스를 묶음별로 나눈 배치"""
+
+    def __init__(self, groups, group_size, changed_groups=(), category=None):
+        # 이미 array 인 묶음은 복사하지 않음 (overlay 는 바뀌지 않은 묶음을 원래 배치와 공유)
+        self.groups = [g if type(g) is array else array('I', g) for g in groups]
+        self.group_size = group_size
+        # 카테고리별 배치면 그 카테고리 이름 (전체 배치는 None)
+        self.category = category
+        # 이전 배치와 비교해 구성이 바뀐 묶음 번호 (캐시를 부분적으로만 갱신할 때 사용)
+        self.changed_groups = frozenset(changed_groups)
+        # 단어 인덱스 → 묶음 번호 (_group_of 참고)
+        self._positions = None
+        self._extra_positions = {}
+
+    @classmethod
+    def shuffled(cls, size, group_size, seed=GROUP_SEED, exclude=()):
+        """고정 시드로 섞은 새 배치 (exclude 의 단어 인덱스는 제외)"""
+        order = list(range(size))
+        random.Random(seed).shuffle(order)
+        if exclude:
+            order = [i for i in order if i not in exclude]
+        groups = [order[i:i + group_size] for i in range(0, len(order), group_size)]
+        return cls(groups, group_size, changed_groups=range(len(groups)))
+
+    @classmethod
+    def reconcile(cls, keys, assignment, group_size):
+        """저장된 배치(묶음별 키 목록)를 현재 단어 목록에 맞게 최소한으로 수정"""
+        index_of = {key: i for i, key in enumerate(keys) if key is not None}
+        groups = []
+        changed = set()
+        placed = set()
+        for group_index, group_keys in enumerate(assignment):
+            group = [index_of[key] for key in group_keys if key in index_of]
+            if len(group) != len(group_keys):
+                changed.add(group_index)
+            placed.update(group)
+            groups.append(group)
+
+        # 새 단어는 마지막 묶음을 채운 뒤 새 묶음으로 추가
+        for i in range(len(keys)):
+            if i in placed or keys[i] is None:
+                continue
+            if not groups or len(groups[-1]) >= group_size:
+                groups.append([])
+            groups[-1].append(i)
+            changed.add(len(groups) - 1)
+
+        # 끝부분의 빈 묶음만 제거 (중간 묶음은 번호 유지를 위해 남겨 둠)
+        while groups and not groups[-1]:
+            groups.pop()
+        changed = {g for g in changed if g < len(groups)}
+        return cls(groups, group_size, changed_groups=changed)
+
+    def _position_table(self):
+        """단어 인덱스 → 묶음 번호 표 (처음 필요할 때 한 번 만듦)
+
+        overlay 로 만든 배치는 원래 배치의 표를 공유하고 붙인 단어만 따로 기록한다.
+        빠진 단어는 표에 남아 있을 수 있으므로 찾은 묶음에 실제로 있는지 확인해야 한다.
+        """
+        if self._positions is None:
+            size = max((max(g) + 1 for g in self.groups if g), default=0)
+            positions = array('I', [NO_GROUP]) * size
+            for group_index, group in enumerate(self.groups):
+                for word_index in group:
+                    positions[word_index] = group_index
+            self._positions = positions
+        return self._positions
+
+    def _group_of(self, i):
+        """단어 인덱스 i 가 있던 묶음 번호 (없으면 None)"""
+        positions = self._position_table()
+        if i < len(positions) and positions[i] != NO_GROUP:
+            return positions[i]
+        return self._extra_positions.get(i)
+
+    def overlay(self, exclude, extra):
+        """exclude 의 단어를 빼고 extra 의 단어를 마지막 묶음 뒤에 붙인 배치 (원래 배치는 그대로)
+
+        바뀐 묶음만 새로 만들고 나머지는 원래 배치와 공유하므로 비용이 묶음 수와 변경 수에만
+        비례한다. extra 중 exclude 에 든 단어도 자리는 차지한 것으로 세서, 붙인 단어를 나중에
+        빼도 뒤에 붙은 단어의 묶음이 바뀌지 않는다.
+        """
+        groups = list(self.groups)
+        changed = set()
+        removed = {}
+        for i in exclude:
+            group_index = self._group_of(i)
+            if group_index is not None:
+                removed.setdefault(group_index, set()).add(i)
+        for group_index, ids in removed.items():
+            group = array('I', (i for i in groups[group_index] if i not in ids))
+            if len(group) != len(groups[group_index]):
+                groups[group_index] = group
+                changed.add(group_index)
+
+        extra_positions = dict(self._extra_positions)
+        used = len(self.groups[-1]) if self.groups else self.group_size
+        for i in extra:
+            if used >= self.group_size:
+                groups.append(array('I'))
+                used = 0
+            used += 1
+            if i in exclude:
+                continue
+            group_index = len(groups) - 1
+            if group_index not in changed:
+                groups[group_index] = array('I', groups[group_index])
+                changed.add(group_index)
+            groups[group_index].append(i)
+            extra_positions[i] = group_index
+        # 새로 붙인 묶음 중 끝부분의 빈 묶음만 제거
+        while len(groups) > len(self.groups) and not groups[-1]:
+            groups.pop()
+        changed = {g for g in changed if g < len(groups)}
+
+        layout = GroupLayout(groups, self.group_size, changed_groups=changed, category=self.category)
+        layout._positions = self._position_table()
+        layout._extra_positions = extra_positions
+        return layout
+
+    def subset(self, members, category):
+        """members 에 속한 단어만 같은 순서로 남겨 다시 묶은 배치 (카테고리별 학습용)"""
+        members = set(members)
+        order = [i for group in self.groups for i in group if i in members]
+        groups = [order[i:i + self.group_size] for i in range(0, len(order), self.group_size)]
+        return GroupLayout(groups, self.group_size, category=category)
+
+    def assignment(self, keys):
+        """저장용 배치 (묶음별 단어 키 목록)"""
+        return [[keys[i] for i in group] for group in self.groups]
+
+    def __len__(self):
+        """묶음 개수"""
+        return len(self.groups)
+
+    def indices(self, group_index):
+        """k번째 묶음에 속한 단어 인덱스"""
+        return self.groups[group_index]
+
+    def next_nonempty(self, group_index):
+        """group_index 이후 처음으로 단어가 있는 묶음 번호 (없으면 len(self))"""
+        while group_index < len(self.groups) and not self.groups[group_index]:
+            group_index += 1
+        return group_index
+
+    def range_indices(self, start_group, stop_group):
+        """start_group 부터 stop_group 직전까지 묶음들의 단어 인덱스"""
+        return [i for group in self.groups[start_group:stop_group] for i in group]
+
+
+class LayoutStore:
+    """모드/묶음 크기별 배치를 JSON 파일로 보관"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name, group_size):
+        return os.path.join(self.directory, f'{name}-{group_size}.json')
+
+    def load(self, name, group_size):
+        """저장된 배치 (없거나 읽을 수 없으면 None)"""
+        try:
+            with open(self._path(name, group_size), 'r', encoding='utf-8') as f:
+                return json.load(f)['groups']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, name, group_size, assignment):
+        path = self._path(name, group_size)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'groups': assignment}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
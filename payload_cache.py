@@ -0,0 +1,58 @@
+"""미리 직렬화한 응답 조각 캐시 (전체 바이트 크기로 제한되는 LRU)
+
+모드의 k번째 묶음 단어 목록은 모든 사용자에게 같으므로, (모드, 파일 버전,
+묶음 단어 ID 해시)마다 JSON 바이트를 한 번만 만들어 두고 재사용한다. 단어가
+추가/삭제되어도 구성이 그대로인 묶음은 같은 키라 계속 쓰고, 바뀐 묶음만 새 항목을
+만든다. 쓰이지 않게 된 예전 항목은 LRU 로 밀려난다.
+"""
+import threading
+from collections import OrderedDict
+
+
+class PayloadCache:
+    """키 → bytes, 저장된 바이트 합이 max_bytes 를 넘으면 오래 안 쓴 것부터 삭제"""
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted_count = 0
+
+    def get(self, key, build):
+        """캐시된 bytes 반환 (없으면 build() 로 만들어 저장)"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+        # 직렬화는 잠금 밖에서 (같은 키를 동시에 만들어도 결과는 같음)
+        payload = build()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evicted_count += 1
+        return payload
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evicted': self.evicted_count
+            }
@@ -0,0 +1,160 @@
+"""발음 음성 사전 생성 (모든 코퍼스의 단어를 미리 합성해서 음성 캐시에 저장)
+
+JSON 폴더의 모든 코퍼스(Words, ed 의 과거형 포함, yb, numbers)에서 단어를 모아
+중복 없이 합성한다. 캐시는 내용 주소 방식이라 이미 있는 파일은 건너뛰므로, 중간에
+멈춰도 다시 실행하면 남은 단어부터 이어서 만든다.
+
+--format 으로 작은 형식(opus, mp3-low)을 고르면 원본을 합성/캐시한 뒤 한 번 변환해서
+그 형식도 캐시에 넣는다 (ffmpeg 필요).
+
+사용법:
+    python pregen_audio.py [--tts gtts|espeak|stub] [--workers 4] [--slow]
+                           [--format opus|mp3-low] [--data-dir static/data]
+                           [--cache-dir instance/audio]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from audio_cache import AudioCache, audio_key
+from audio_formats import COMPACT_FORMATS, transcode
+from tts import SYNTHESIZERS, get_synthesizer
+
+# 음성을 만들 필드 (ed 모드는 과거형도)
+AUDIO_FIELDS = ('word', 'past_tense')
+
+
+def corpus_texts(data_dir):
+    """JSON 폴더의 모든 단어/과거형 (파일 이름 순, 대소문자까지 같은 것은 한 번만)"""
+    texts = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(data_dir, filename), 'r', encoding='utf-8') as f:
+            for word in json.load(f):
+                for name in AUDIO_FIELDS:
+                    text = (word.get(name) or '').strip()
+                    if text:
+                        texts.setdefault(text, None)
+    return list(texts)
+
+
+class Progress:
+    """진행 상황 집계 (interval 초마다 한 줄 출력)"""
+
+    def __init__(self, total, interval=2.0, out=sys.stdout):
+        self.total = total
+        self.interval = interval
+        self.out = out
+        self.done = 0
+        self.skipped = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, skipped=False, failed=False):
+        with self._lock:
+            self.done += 1
+            self.skipped += skipped
+            self.failed += failed
+            now = time.monotonic()
+            if now - self._last >= self.interval or self.done == self.total:
+                self._last = now
+                self.report()
+
+    def report(self):
+        elapsed = time.monotonic() - self.started
+        made = self.done - self.skipped - self.failed
+        rate = made / elapsed if elapsed else 0.0
+        print(f"{self.done}/{self.total} (생성 {made}, 건너뜀 {self.skipped}, 실패 {self.failed}, "
+              f"{rate:.1f}개/초)", file=self.out, flush=True)
+
+
+def pregenerate(texts, cache, synthesizer, workers=4, slow=False, lang='en', progress=None, fmt=None):
+    """texts 를 합성해서 cache 에 저장 (이미 있으면 건너뜀), 실패한 텍스트 목록 반환
+
+    fmt 가 합성기 형식과 다르면 원본을 캐시한 뒤 변환한 것도 저장한다. 한 번에
+    workers * 2 개까지만 작업을 넣어서 단어가 많아도 메모리가 늘지 않는다.
+    """
+    progress = progress or Progress(len(texts))
+    source_fmt = synthesizer.fmt
+    fmt = fmt or source_fmt
+    failed = []
+
+    def work(text):
+        key = audio_key(text, lang, synthesizer.voice, slow, fmt)
+        if cache.get(key, fmt) is not None:
+            return 'skipped'
+        source_key = audio_key(text, lang, synthesizer.voice, slow, source_fmt)
+        source_path = cache.get(source_key, source_fmt)
+        if source_path is None:
+            audio = synthesizer.synthesize(text, lang=lang, slow=slow)
+            cache.put(source_key, audio, source_fmt)
+        else:
+            with open(source_path, 'rb') as f:
+                audio = f.read()
+        if fmt != source_fmt:
+            cache.put(key, transcode(audio, fmt), fmt)
+        return 'made'
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        remaining = iter(texts)
+        try:
+            while True:
+                for text in remaining:
+                    pending[pool.submit(work, text)] = text
+                    if len(pending) >= workers * 2:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    text = pending.pop(future)
+                    try:
+                        progress.add(skipped=future.result() == 'skipped')
+                    except Exception as e:
+                        failed.append(text)
+                        progress.add(failed=True)
+                        print(f"{text!r} 합성 실패: {e}", file=progress.out)
+        except KeyboardInterrupt:
+            # 진행 중인 작업만 마치고 종료 (파일은 원자적으로 써서 반쯤 쓰인 파일은 없음)
+            for future in pending:
+                future.cancel()
+            print("중단했습니다. 다시 실행하면 이어서 생성합니다.", file=progress.out)
+            raise
+    return failed
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='발음 음성 사전 생성')
+    parser.add_argument('--tts', choices=sorted(SYNTHESIZERS), default=os.getenv('TTS_BACKEND', 'gtts'))
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--slow', action='store_true', help='느린 발음으로 생성')
+    parser.add_argument('--format', choices=sorted(COMPACT_FORMATS), help='원본과 함께 변환해서 저장할 형식')
+    parser.add_argument('--data-dir', default=os.path.join(base_dir, 'static', 'data'))
+    parser.add_argument('--cache-dir', default=os.path.join(base_dir, 'instance', 'audio'))
+    args = parser.parse_args(argv)
+
+    synthesizer = get_synthesizer(args.tts)
+    texts = corpus_texts(args.data_dir)
+    cache = AudioCache(args.cache_dir)
+    print(f"{len(texts)}개 단어, 합성기 {args.tts}, 작업자 {args.workers}명")
+    try:
+        failed = pregenerate(texts, cache, synthesizer, workers=max(args.workers, 1), slow=args.slow,
+                             fmt=args.format)
+    except KeyboardInterrupt:
+        return 130
+    stats = cache.stats()
+    print(f"완료: 캐시 {stats['entries']}개 파일, {stats['bytes']:,} bytes, 실패 {len(failed)}개")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""사용자 진행 상황 write-behind 저장소
+
+정답 하나마다 users.json 전체를 읽고 다시 쓰지 않도록, 진행 상황은 메모리에서
+읽고 쓰며 변경된 (사용자, 모드)만 모아 두었다가 주기적으로(또는 일정 개수가
+쌓이면) 한 번에 저장한다. 프로세스 종료 시에도 남은 변경분을 저장한다.
+
+여러 워커가 같은 저장소를 쓰는 경우(SQLite)에는 저장되지 않은 변경분만 메모리에
+두고, 나머지는 요청마다 저장소에서 읽어 다른 워커의 변경을 덮어쓰지 않는다.
+"""
+import atexit
+import copy
+import threading
+from datetime import datetime
+
+
+def default_progress():
+    """모드별 기본 진행 상황"""
+    return {
+        'category': '전체',
+        'completed_count': 0,
+        'current_group_index': 0,
+        'review_mode': False,
+        'review_start_group': 0,
+        'last_study_date': None
+    }
+
+
+class ProgressStore:
+    """메모리에서 진행 상황을 제공하고 변경분을 묶어서 저장하는 저장소
+
+    load_fn() 은 {username: {'password': ..., 'progress': {...}}} 형태의 사용자 목록을,
+    save_fn(records) 는 {username: {mode: progress}} 형태의 변경분(바뀐 모드만)을 받아
+    영구 저장한다. load_mode_fn(username, mode) 가 주어지면 전체 목록을 캐시하지 않고
+    매번 (사용자, 모드) 1행을 읽는다 (모르는 사용자면 None, 기록이 없으면 {} 반환).
+    """
+
+    def __init__(self, load_fn, save_fn, flush_interval=5.0, max_dirty=20, load_mode_fn=None):
+        self._load_fn = load_fn
+        self._load_mode_fn = load_mode_fn
+        self._save_fn = save_fn
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._progress = None  # {username: {mode: progress}}
+        self._dirty = set()  # {(username, mode)}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.flush_count = 0
+
+    def _load(self):
+        """저장소에서 전체 진행 상황을 다시 읽기"""
+        users = self._load_fn()
+        progress = {}
+        for username, user_data in users.items():
+            if isinstance(user_data, dict):
+                progress[username] = copy.deepcopy(user_data.get('progress', {}))
+            else:
+                progress[username] = {}
+        with self._lock:
+            # 아직 저장되지 않은 변경분은 메모리 값을 유지
+            if self._progress is not None:
+                for username, mode in self._dirty:
+                    progress.setdefault(username, {})[mode] = self._progress[username][mode]
+            self._progress = progress
+
+    def _user(self, username):
+        """사용자 진행 상황 dict 반환 (모르는 사용자면 한 번 다시 로드)"""
+        if self._progress is None:
+            self._load()
+        if username not in self._progress:
+            # 파일에 새로 추가된 사용자일 수 있음
+            self._load()
+        return self._progress.get(username)
+
+    def _mode(self, username, mode):
+        """(사용자, 모드) 진행 상황 dict 반환 (모르는 사용자면 None)
+
+        load_mode_fn 이 있으면 저장 대기 중인 변경분만 메모리에서 읽고
+        나머지는 저장소에서 새로 읽는다.
+        """
+        if self._load_mode_fn is None:
+            user_progress = self._user(username)
+            if user_progress is None:
+                return None
+            return user_progress.setdefault(mode, {})
+        if self._progress is None:
+            self._progress = {}
+        pending = self._progress.get(username)
+        if pending is not None and mode in pending:
+            return pending[mode]
+        return self._load_mode_fn(username, mode)
+
+    def get(self, username, mode='Words'):
+        """사용자의 모드별 진행 상황 복사본 반환"""
+        with self._lock:
+            mode_progress = self._mode(username, mode)
+            if not mode_progress:
+                return default_progress()
+            return dict(mode_progress)
+
+    def update(self, username, mode, progress_data):
+        """진행 상황을 메모리에 반영하고 저장 대기열에 추가"""
+        with self._lock:
+            mode_progress = self._mode(username, mode)
+            if mode_progress is None:
+                return
+            mode_progress.update(progress_data)
+            mode_progress['last_study_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._progress.setdefault(username, {})[mode] = mode_progress
+            self._dirty.add((username, mode))
+            if len(self._dirty) >= self.max_dirty:
+                self._wake.set()
+        self._ensure_thread()
+
+    def invalidate(self):
+        """다음 조회 시 저장소에서 다시 읽도록 표시"""
+        with self._lock:
+            if not self._dirty:
+                self._progress = None
+
+    def flush(self):
+        """대기 중인 변경분을 한 번에 저장"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                keys = set(self._dirty)
+                records = {}
+                for username, mode in keys:
+                    records.setdefault(username, {})[mode] = copy.deepcopy(self._progress[username][mode])
+                self._dirty.clear()
+            try:
+                self._save_fn(records)
+            except Exception as e:
+                print(f"진행 상황 저장 오류: {e}")
+                with self._lock:
+                    self._dirty.update(keys)
+                return 0
+            if self._load_mode_fn is not None:
+                # 저장이 끝난 행은 메모리에서 빼고 다음 요청부터 저장소에서 읽음
+                with self._lock:
+                    for username, mode in keys - self._dirty:
+                        pending = self._progress.get(username, {})
+                        pending.pop(mode, None)
+                        if not pending:
+                            self._progress.pop(username, None)
+            self.flush_count += 1
+            return len(keys)
+
+    def pending_count(self):
+        """저장 대기 중인 사용자 수"""
+        with self._lock:
+            return len({username for username, _ in self._dirty})
+
+    def _ensure_thread(self):
+        if self._thread is not None or self._stop.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='progress-flush', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """백그라운드 저장 중지 후 남은 변경분 저장"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
@@ -0,0 +1,167 @@
+"""단어 접두어 검색 색인 (정렬된 배열 + bisect)
+
+모드별로 (대소문자를 무시한 키, 단어 ID) 를 키 순서로 정렬해 두고, 접두어 검색은
+bisect 로 시작 위치를 찾은 뒤 접두어가 맞는 동안만 읽는다. 여러 모드의 결과는 키
+순서로 합쳐서 앞에서부터 limit 개만 반환한다.
+
+코퍼스 스냅샷이 바뀌면 같은 파일 버전 위의 변경(저널로 추가/삭제된 단어)은 바뀐
+단어만 색인에 넣고 빼며, 파일 자체가 바뀌었을 때(압축 포함)만 다시 만든다.
+"""
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+
+# 검색 키로 쓰는 필드 (ed 모드는 과거형으로도 찾을 수 있음)
+SEARCH_FIELDS = ('word', 'past_tense')
+
+
+class ModeIndex:
+    """모드 1개의 정렬된 (키, 단어 ID) 배열"""
+
+    def __init__(self, corpus):
+        entries = []
+        for name in SEARCH_FIELDS:
+            # 처음 만들 때는 필드 1개씩 한꺼번에 읽음 (바이너리 코퍼스는 그 필드만 디코딩)
+            if hasattr(corpus.words, 'field_values'):
+                values = corpus.words.field_values(name)
+            else:
+                values = [w.get(name) for w in corpus.words]
+            entries.extend((value.casefold(), word_id) for word_id, value in enumerate(values)
+                           if value and word_id not in corpus.deleted)
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.ids = [word_id for _, word_id in entries]
+        self.base_version = corpus.base_version
+        self.version = corpus.version
+        self.size = len(corpus.words)
+        self.deleted = corpus.deleted
+
+    @staticmethod
+    def _entries(corpus, word_ids, deleted=()):
+        for name in SEARCH_FIELDS:
+            for word_id in word_ids:
+                if word_id in deleted:
+                    continue
+                value = corpus.field_value(word_id, name)
+                if value:
+                    yield value.casefold(), word_id
+
+    def can_update(self, corpus):
+        """같은 파일 버전 위에 변경만 더해진 스냅샷인지 (그러면 바뀐 단어만 반영 가능)"""
+        return (corpus.base_version == self.base_version and len(corpus.words) >= self.size
+                and corpus.deleted >= self.deleted)
+
+    def update(self, corpus):
+        """새로 추가/삭제된 단어만 반영"""
+        for word_id in corpus.deleted - self.deleted:
+            if word_id < self.size:
+                self._remove(corpus, word_id)
+        for key, word_id in self._entries(corpus, range(self.size, len(corpus.words)), corpus.deleted):
+            i = bisect_right(self.keys, key)
+            self.keys.insert(i, key)
+            self.ids.insert(i, word_id)
+        self.version = corpus.version
+        self.size = len(corpus.words)
+        self.deleted = corpus.deleted
+
+    def _remove(self, corpus, word_id):
+        for name in SEARCH_FIELDS:
+            value = corpus.field_value(word_id, name)
+            if not value:
+                continue
+            key = value.casefold()
+            i = bisect_left(self.keys, key)
+            while i < len(self.keys) and self.keys[i] == key:
+                if self.ids[i] == word_id:
+                    del self.keys[i]
+                    del self.ids[i]
+                    break
+                i += 1
+
+    def matches(self, prefix):
+        """접두어가 맞는 (키, 단어 ID) 를 키 순서로"""
+        i = bisect_left(self.keys, prefix)
+        keys = self.keys
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield keys[i], self.ids[i]
+            i += 1
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _tagged(matches, mode, corpus, hidden=()):
+    """(키, 단어 ID) 에 모드와 코퍼스를 붙임 (hidden 의 단어는 제외)"""
+    for key, word_id in matches:
+        if word_id not in hidden:
+            yield key, mode, word_id, corpus
+
+
+class SearchIndex:
+    """CorpusRegistry 의 모든 모드에 대한 접두어 검색 (검색할 때 스냅샷 버전을 확인해서 갱신)"""
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._modes = {}
+        self._lock = threading.Lock()
+        self.build_count = 0
+        self.update_count = 0
+
+    def _index(self, mode):
+        """최신 스냅샷과 그 색인 (잠금 안에서 호출)"""
+        corpus = self._registry.get(mode)
+        index = self._modes.get(mode)
+        if index is None or index.version != corpus.version:
+            if index is not None and index.can_update(corpus):
+                index.update(corpus)
+                self.update_count += 1
+            else:
+                index = self._modes[mode] = ModeIndex(corpus)
+                self.build_count += 1
+        return corpus, index
+
+    def warm(self):
+        """모든 모드의 색인을 미리 만듦 (시작할 때 백그라운드에서 호출)"""
+        for mode in self._registry.names():
+            with self._lock:
+                self._index(mode)
+
+    def search(self, prefix, modes=None, limit=10, personal=None):
+        """접두어(대소문자 무시)로 시작하는 단어 [(모드, 코퍼스, 단어 ID)] (키 순서, 최대 limit 개)
+
+        personal 에 모드별 개인 스냅샷을 주면 숨긴 단어는 빼고 추가한 단어도 찾는다.
+        """
+        prefix = prefix.casefold()
+        if not prefix:
+            return []
+        personal = personal or {}
+        with self._lock:
+            streams = []
+            for mode in modes or self._registry.names():
+                corpus, index = self._index(mode)
+                overlay = personal.get(mode)
+                if overlay is None or overlay.parent is not corpus:
+                    streams.append(_tagged(index.matches(prefix), mode, corpus))
+                    continue
+                streams.append(_tagged(index.matches(prefix), mode, overlay, hidden=overlay.deleted))
+                # 개인 단어장에 추가한 단어는 몇 개 안 되므로 그때그때 확인
+                added = range(len(corpus.words), len(overlay.words))
+                streams.append(_tagged(sorted(m for m in ModeIndex._entries(overlay, added)
+                                              if m[0].startswith(prefix)), mode, overlay))
+            results = []
+            seen = set()
+            for key, mode, word_id, corpus in heapq.merge(*streams, key=lambda m: m[0]):
+                # 단어와 과거형이 모두 맞는 단어는 한 번만
+                if (mode, word_id) not in seen:
+                    seen.add((mode, word_id))
+                    results.append((mode, corpus, word_id))
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def stats(self):
+        return {
+            'entries': {mode: len(index) for mode, index in self._modes.items()},
+            'builds': self.build_count,
+            'updates': self.update_count
+        }
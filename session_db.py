@@ -0,0 +1,164 @@
+"""SQLite 기반 학습 세션 저장소 (여러 워커 프로세스가 공유)
+
+SessionStore 는 프로세스 안의 dict 라서 gunicorn 워커가 여러 개면 /api/init 을
+처리한 워커가 아닌 곳으로 요청이 가면 세션을 찾지 못한다. 이 저장소는 세션을
+SQLite(WAL) 파일 하나에 두어 모든 워커가 같은 세션을 보게 한다.
+
+세션 1개 = 1행 (StudySession.to_state() 의 JSON)이고, 조회/저장은 기본 키로 한 번씩만
+접근하므로 정답 확인 경로에 둘 수 있다. 사용 시각은 일정 간격 이상 지났을 때만
+갱신해서 조회할 때마다 쓰기가 생기지 않게 한다.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from session_store import StudySession
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+"""
+
+SQL_GET = "SELECT data, last_access FROM sessions WHERE session_id = ?"
+SQL_UPSERT = ("INSERT INTO sessions (session_id, data, last_access) VALUES (?, ?, ?) "
+              "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, "
+              "last_access = excluded.last_access")
+SQL_TOUCH = "UPDATE sessions SET last_access = ? WHERE session_id = ?"
+SQL_DELETE = "DELETE FROM sessions WHERE session_id = ?"
+SQL_DELETE_EXPIRED = "DELETE FROM sessions WHERE last_access <= ?"
+SQL_COUNT = "SELECT COUNT(*) FROM sessions"
+SQL_DELETE_OLDEST = ("DELETE FROM sessions WHERE session_id IN "
+                     "(SELECT session_id FROM sessions ORDER BY last_access LIMIT ?)")
+SQL_STATS = "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions"
+
+
+def encode_session(data):
+    return json.dumps(data.to_state(), separators=(',', ':'))
+
+
+def decode_session(text):
+    return StudySession.from_state(json.loads(text))
+
+
+class SQLiteSessionStore:
+    """SessionStore 와 같은 인터페이스의 공유 세션 저장소
+
+    저장된 객체는 복사본이므로 세션을 수정한 뒤에는 store[session_id] = session 으로
+    다시 저장해야 한다.
+    """
+
+    def __init__(self, path, ttl=2 * 60 * 60, max_entries=5000, sweep_interval=60,
+                 touch_interval=30):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        # 이 시간보다 최근에 사용한 세션은 조회할 때 사용 시각을 다시 쓰지 않음
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.expired_count = 0
+        self.evicted_count = 0
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self):
+        """현재 스레드 전용 연결 반환 (없으면 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, cached_statements=64)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id, default=None):
+        """세션 반환 (만료됐으면 default), 사용 시각 갱신"""
+        if session_id is None:
+            return default
+        conn = self._conn()
+        row = conn.execute(SQL_GET, (session_id,)).fetchone()
+        if row is None:
+            return default
+        data, last_access = row
+        now = time.time()
+        if now - last_access > self.ttl:
+            with conn:
+                conn.execute(SQL_DELETE, (session_id,))
+            self.expired_count += 1
+            return default
+        if now - last_access > self.touch_interval:
+            with conn:
+                conn.execute(SQL_TOUCH, (now, session_id))
+        return decode_session(data)
+
+    def __getitem__(self, session_id):
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __setitem__(self, session_id, data):
+        conn = self._conn()
+        with conn:
+            conn.execute(SQL_UPSERT, (session_id, encode_session(data), time.time()))
+        self._ensure_sweeper()
+
+    def pop(self, session_id, default=None):
+        data = self.get(session_id)
+        if data is None:
+            return default
+        conn = self._conn()
+        with conn:
+            conn.execute(SQL_DELETE, (session_id,))
+        return data
+
+    def __len__(self):
+        return self._conn().execute(SQL_COUNT).fetchone()[0]
+
+    def sweep(self):
+        """만료된 세션과 최대 개수를 넘은 오래된 세션 삭제 (만료로 삭제한 개수 반환)"""
+        conn = self._conn()
+        with conn:
+            removed = conn.execute(SQL_DELETE_EXPIRED, (time.time() - self.ttl,)).rowcount
+            excess = conn.execute(SQL_COUNT).fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.evicted_count += conn.execute(SQL_DELETE_OLDEST, (excess,)).rowcount
+        self.expired_count += removed
+        return removed
+
+    def _ensure_sweeper(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='session-db-sweeper', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except sqlite3.Error as e:
+                print(f"세션 정리 오류: {e}")
+
+    def stats(self):
+        live, size = self._conn().execute(SQL_STATS).fetchone()
+        return {
+            'backend': 'sqlite',
+            'live': live,
+            'bytes': size,
+            'expired': self.expired_count,
+            'evicted': self.evicted_count
+        }
@@ -0,0 +1,212 @@
+"""학습 세션 저장소 (유휴 만료 + 최대 개수 제한)
+
+/api/init 이 호출될 때마다 세션이 생기므로, 일정 시간 사용하지 않은 세션은
+백그라운드에서 지우고 최대 개수를 넘으면 가장 오래 사용하지 않은 세션부터 지운다.
+"""
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+
+def approx_size(obj, _seen=None):
+    """객체가 차지하는 대략적인 메모리 크기 (bytes)"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, _seen) + approx_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approx_size(v, _seen) for v in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(approx_size(getattr(obj, name), _seen)
+                    for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+class StudySession:
+    """학습 세션 1개 (단어 dict 대신 공유 코퍼스의 단어 ID 만 보관)
+
+    word_ids 는 현재 학습 중인 단어 ID 목록, incorrect 는 word_ids 위치별로
+    틀린 단어를 표시한 비트마스크이다.
+    """
+
+    __slots__ = ('username', 'mode', 'corpus_version', 'group_index', 'word_ids',
+                 'incorrect', 'correct_count', 'total_attempts', 'repeat_count', 'review_mode')
+
+    def __init__(self, username, mode='Words'):
+        self.username = username
+        self.mode = mode
+        self.corpus_version = None
+        self.group_index = 0
+        self.word_ids = array('l')
+        self.incorrect = 0
+        self.correct_count = 0
+        self.total_attempts = 0
+        self.repeat_count = 0
+        self.review_mode = False
+
+    def load_group(self, mode, corpus_version, group_index, word_ids, review_mode=False):
+        """새 묶음(또는 복습 세트)으로 교체하고 기록 초기화"""
+        self.mode = mode
+        self.corpus_version = corpus_version
+        self.group_index = group_index
+        self.review_mode = review_mode
+        self.restart(word_ids)
+
+    def restart(self, word_ids=None):
+        """같은 묶음에서 단어 목록을 바꾸거나(틀린 단어 반복) 그대로 다시 시작"""
+        if word_ids is not None:
+            self.word_ids = array('l', word_ids)
+        self.incorrect = 0
+        self.correct_count = 0
+        self.total_attempts = 0
+        self.repeat_count = 0
+
+    def move_to(self, mode, corpus_version, group_index, word_ids, incorrect_positions=()):
+        """다른 코퍼스 버전으로 단어 목록 옮기기 (점수는 유지, 틀린 단어 표시는 새 위치로)"""
+        self.mode = mode
+        self.corpus_version = corpus_version
+        self.group_index = group_index
+        self.word_ids = array('l', word_ids)
+        self.incorrect = 0
+        for position in incorrect_positions:
+            self.mark_incorrect(position)
+
+    def position_of(self, word_id):
+        """현재 단어 목록에서 word_id 의 위치 (없으면 -1)"""
+        try:
+            return self.word_ids.index(word_id)
+        except (ValueError, TypeError):
+            return -1
+
+    def mark_incorrect(self, position):
+        self.incorrect |= 1 << position
+
+    def is_incorrect(self, position):
+        return bool(self.incorrect >> position & 1)
+
+    def incorrect_ids(self):
+        """틀린 단어 ID 목록 (출제 순서 유지)"""
+        return [word_id for i, word_id in enumerate(self.word_ids) if self.incorrect >> i & 1]
+
+    def to_state(self):
+        """저장/전송용 상태 (JSON 으로 직렬화 가능한 리스트)"""
+        return [self.username, self.mode, self.corpus_version, self.group_index,
+                list(self.word_ids), self.incorrect, self.correct_count,
+                self.total_attempts, self.repeat_count, int(self.review_mode)]
+
+    @classmethod
+    def from_state(cls, state):
+        """to_state() 결과로 세션 복원"""
+        (username, mode, corpus_version, group_index, word_ids, incorrect,
+         correct_count, total_attempts, repeat_count, review_mode) = state
+        session = cls(username, mode)
+        session.corpus_version = corpus_version
+        session.group_index = group_index
+        session.word_ids = array('l', word_ids)
+        session.incorrect = incorrect
+        session.correct_count = correct_count
+        session.total_attempts = total_attempts
+        session.repeat_count = repeat_count
+        session.review_mode = bool(review_mode)
+        return session
+
+
+class SessionStore:
+    """TTL 과 LRU 로 크기가 제한되는 세션 저장소 (dict 처럼 사용)"""
+
+    def __init__(self, ttl=2 * 60 * 60, max_entries=5000, sweep_interval=60):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._entries = OrderedDict()  # session_id -> (last_access, data), 오래된 순
+        self._lock = threading.Lock()
+        self._thread = None
+        self.expired_count = 0
+        self.evicted_count = 0
+
+    def get(self, session_id, default=None):
+        """세션 반환 (만료됐으면 default), 사용 시각 갱신"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return default
+            if now - entry[0] > self.ttl:
+                del self._entries[session_id]
+                self.expired_count += 1
+                return default
+            self._entries[session_id] = (now, entry[1])
+            self._entries.move_to_end(session_id)
+            return entry[1]
+
+    def __getitem__(self, session_id):
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __setitem__(self, session_id, data):
+        with self._lock:
+            self._entries[session_id] = (time.monotonic(), data)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted_count += 1
+        self._ensure_sweeper()
+
+    def pop(self, session_id, default=None):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+        return default if entry is None else entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def sweep(self):
+        """만료된 세션 삭제 (삭제한 개수 반환)"""
+        deadline = time.monotonic() - self.ttl
+        removed = 0
+        with self._lock:
+            # 오래된 순서로 정렬되어 있으므로 만료되지 않은 세션을 만나면 중단
+            while self._entries:
+                session_id, (last_access, _) = next(iter(self._entries.items()))
+                if last_access > deadline:
+                    break
+                del self._entries[session_id]
+                removed += 1
+            self.expired_count += removed
+        return removed
+
+    def _ensure_sweeper(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='session-sweeper', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            self.sweep()
+
+    def stats(self):
+        with self._lock:
+            values = [data for _, data in self._entries.values()]
+        seen = set()  # 여러 세션이 공유하는 단어는 한 번만 계산
+        return {
+            'backend': 'memory',
+            'live': len(values),
+            'bytes': sum(approx_size(data, seen) for data in values),
+            'expired': self.expired_count,
+            'evicted': self.evicted_count
+        }
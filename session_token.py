@@ -0,0 +1,91 @@
+"""서명된 학습 세션 토큰 (서버에 세션을 저장하지 않는 방식)
+
+세션 상태(모드, 묶음 번호, 단어 ID, 틀린 단어, 정답/시도 수)를 app.secret_key 로
+서명한 토큰에 담아 X-Session-Token 응답 헤더로 보내고, 클라이언트는 다음 요청에
+같은 헤더로 돌려보낸다. 서버는 토큰을 검증해서 세션을 복원하고, 바뀐 세션은 새
+토큰으로 다시 보낸다. 어느 워커든 어떤 요청이든 처리할 수 있고, 서버를 재시작해도
+세션이 사라지지 않는다.
+"""
+from flask import g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from session_store import StudySession
+
+TOKEN_HEADER = 'X-Session-Token'
+
+
+class TokenSessionStore:
+    """SessionStore 와 같은 인터페이스로 동작하는 토큰 세션 저장소
+
+    get() 은 요청 헤더의 토큰을 검증해서 세션을 만들고, store[session_id] = session
+    은 새 토큰을 만들어 응답 헤더에 붙인다 (init_app 으로 등록).
+    """
+
+    def __init__(self, secret_key, ttl=2 * 60 * 60, user_fn=None):
+        self.ttl = ttl
+        # 토큰의 사용자와 현재 로그인한 사용자가 같은지 확인하는 함수
+        self._user_fn = user_fn
+        self._serializer = URLSafeTimedSerializer(secret_key, salt='study-session')
+        self.issued_count = 0
+        self.rejected_count = 0
+        self.token_bytes = 0
+
+    def init_app(self, app):
+        app.after_request(self._attach_token)
+
+    def _attach_token(self, response):
+        token = g.pop('session_token', None)
+        if token is not None:
+            response.headers[TOKEN_HEADER] = token
+        return response
+
+    def get(self, session_id, default=None):
+        """요청 헤더의 토큰으로 세션 복원 (없거나 위조/만료/다른 세션이면 default)"""
+        token = request.headers.get(TOKEN_HEADER)
+        if not token or session_id is None:
+            return default
+        try:
+            token_session_id, state = self._serializer.loads(token, max_age=self.ttl)
+            user_session = StudySession.from_state(state)
+        except (BadSignature, TypeError, ValueError):
+            self.rejected_count += 1
+            return default
+        if token_session_id != session_id or (
+                self._user_fn is not None and user_session.username != self._user_fn()):
+            self.rejected_count += 1
+            return default
+        return user_session
+
+    def __getitem__(self, session_id):
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __setitem__(self, session_id, data):
+        token = self._serializer.dumps([session_id, data.to_state()])
+        g.session_token = token
+        self.issued_count += 1
+        self.token_bytes += len(token)
+
+    def pop(self, session_id, default=None):
+        # 서버에 남는 상태가 없으므로 삭제할 것도 없음
+        return self.get(session_id, default)
+
+    def __len__(self):
+        return 0
+
+    def sweep(self):
+        # 만료는 토큰의 서명 시각으로 검사
+        return 0
+
+    def stats(self):
+        return {
+            'backend': 'token',
+            'issued': self.issued_count,
+            'rejected': self.rejected_count,
+            'avg_token_bytes': round(self.token_bytes / self.issued_count, 1) if self.issued_count else 0
+        }
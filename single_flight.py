@@ -0,0 +1,74 @@
+"""동시에 들어온 같은 작업을 한 번만 실행 (single-flight)
+
+같은 키로 진행 중인 작업이 있으면 새로 실행하지 않고 그 결과를 기다려서 함께 쓴다.
+먼저 온 요청(leader)이 실행하고, 실패하면 기다리던 요청에도 같은 예외를 전달한다.
+결과는 보관하지 않으므로 끝난 뒤에 온 요청은 다시 실행한다 (결과 캐시는 호출하는 쪽에서).
+"""
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """진행 중인 같은 작업을 timeout 안에 기다리지 못함"""
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키 → 진행 중인 작업 1개"""
+
+    def __init__(self, timeout=30.0):
+        # 기다리는 요청의 최대 대기 시간 (초, 실행하는 요청에는 적용되지 않음)
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed_count = 0
+        self.coalesced_count = 0
+        self.timeout_count = 0
+        self.error_count = 0
+
+    def do(self, key, fn, timeout=None):
+        """fn() 결과 반환 (같은 key 가 진행 중이면 그 결과를 기다림)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed_count += 1
+            else:
+                self.coalesced_count += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                self.error_count += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(self.timeout if timeout is None else timeout):
+            self.timeout_count += 1
+            raise SingleFlightTimeout(f'{key!r} 작업을 기다리는 중 시간 초과')
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            'in_flight': in_flight,
+            'executed': self.executed_count,
+            'coalesced': self.coalesced_count,
+            'timeouts': self.timeout_count,
+            'errors': self.error_count
+        }
@@ -7,6 +7,26 @@ let allWords = [];
 let totalWordsCount = 0;
 let currentGroupIndex = 0;
 let totalGroups = 0;
+let wordShownAt = 0;  // 현재 단어를 표시한 시각 (응답 시간 측정용)
+let sessionToken = null;  // 서버가 토큰 세션을 쓸 때 받은 학습 세션 토큰
+let pendingAnswers = [];  // 묶음이 끝날 때 한 번에 제출할 답안
+let groupAudio = {};  // 단어 → 미리 받아 둔 발음 (Blob URL)
+// Ogg Opus 를 재생할 수 있으면 가장 작은 형식으로 요청 (서버에 변환기가 없으면 서버가 다른 형식을 고름)
+const audioFormat = new Audio().canPlayType('audio/ogg; codecs=opus') ? 'opus' : '';
+
+// API 요청 (학습 세션 토큰을 주고받음)
+async function apiFetch(url, options = {}) {
+    const headers = new Headers(options.headers || {});
+    if (sessionToken) {
+        headers.set('X-Session-Token', sessionToken);
+    }
+    const response = await fetch(url, { ...options, headers });
+    const token = response.headers.get('X-Session-Token');
+    if (token) {
+        sessionToken = token;
+    }
+    return response;
+}
 
 // 초기화
 document.addEventListener('DOMContentLoaded', async () => {
@@ -15,18 +35,20 @@ document.addEventListener('DOMContentLoaded', async () => {
     document.addEventListener('keydown', (e) => {
         if (e.key === ' ' || e.code === 'Space') {
             e.preventDefault();
-            playAudio();
+            playAudio(e.shiftKey);
         }
     });
 });
 
 async function initApp() {
     try {
-        const response = await fetch('/api/init');
+        const response = await apiFetch('/api/init');
         const data = await response.json();
         
         sessionId = data.session_id;
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         allWords = data.categories;
         totalWordsCount = data.total_words_count || 0;
         currentGroupIndex = data.current_group_index || 0;
@@ -41,6 +63,11 @@ async function initApp() {
             option.textContent = cat;
             categorySelect.appendChild(option);
         });
+        if (data.user_progress && data.user_progress.category) {
+            categorySelect.value = data.user_progress.category;
+        }
+        // 카테고리를 바꾸면 그 카테고리의 묶음으로 학습
+        categorySelect.addEventListener('change', () => nextNineWords());
         
         // 사용자 진행 상황 표시
         if (data.user_progress) {
@@ -101,6 +128,7 @@ function displayWord() {
     document.getElementById('answerInput').focus();
     document.getElementById('resultMessage').textContent = '';
     document.getElementById('resultMessage').className = 'result-message';
+    wordShownAt = performance.now();
     
     updateStats();
 }
@@ -120,26 +148,24 @@ async function checkAnswer() {
     const word = currentSet[currentIndex];
     
     try {
-        const response = await fetch('/api/check-answer', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                session_id: sessionId,
-                user_input: input,
-                word_data: word,
-                mode: currentMode
-            })
+        // 화면에서 바로 채점하고, 답안은 묶음이 끝날 때 서버에 한 번에 제출
+        const isCorrect = gradeAnswer(word, input);
+        pendingAnswers.push({
+            id: word.id,
+            word: word.word,
+            user_input: input,
+            latency_ms: Math.round(performance.now() - wordShownAt),
+            is_correct: isCorrect
         });
         
-        const data = await response.json();
         const resultDiv = document.getElementById('resultMessage');
         
         // 정확도 업데이트
-        if (data.accuracy !== undefined) {
-            document.getElementById('accuracyStats').textContent = `정확도: ${data.accuracy}%`;
-        }
+        const correctCount = pendingAnswers.filter(a => a.is_correct).length;
+        const accuracy = (correctCount / pendingAnswers.length * 100).toFixed(1);
+        document.getElementById('accuracyStats').textContent = `정확도: ${accuracy}%`;
         
-        if (data.is_correct) {
+        if (isCorrect) {
             if (currentMode === 'ed') {
                 resultDiv.innerHTML = `✅ 정답: ${word.word} → ${word.past_tense}<br><br><span style="color: #666; font-size: 13px;">👉 Enter를 눌러 다음 단어로 이동</span>`;
             } else if (currentMode === 'yb') {
@@ -181,24 +207,55 @@ async function checkAnswer() {
     }
 }
 
+// 서버 채점 규칙과 같은 방식으로 채점 (ed 모드는 "원형/과거형")
+function gradeAnswer(word, input) {
+    const answer = input.toLowerCase().trim();
+    if (currentMode === 'ed') {
+        const parts = answer.split('/');
+        return parts.length === 2 &&
+            parts[0].trim() === (word.word || '').toLowerCase() &&
+            parts[1].trim() === (word.past_tense || '').toLowerCase();
+    }
+    return answer === (word.word || '').toLowerCase();
+}
+
 async function nextWord() {
+    // 묶음 안에서는 서버 요청 없이 다음 단어로
+    if (currentIndex < currentSet.length - 1) {
+        currentIndex++;
+        displayWord();
+        return;
+    }
+    
     try {
-        const response = await fetch('/api/next-word', {
+        // 묶음의 마지막 단어: 모아 둔 답안을 한 번에 제출하고 다음 동작을 받음
+        const answers = pendingAnswers.map(({ id, word, user_input, latency_ms }) => ({ id, word, user_input, latency_ms }));
+        const response = await apiFetch('/api/submit-answers', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
                 session_id: sessionId,
-                current_index: currentIndex
+                mode: currentMode,
+                answers: answers
             })
         });
         
         const data = await response.json();
+        if (!response.ok) {
+            // 제출하지 못한 답안은 남겨 두고 다시 Enter 를 누르면 다시 제출
+            alert(data.error || '답안을 제출하지 못했습니다. 다시 시도해 주세요.');
+            return;
+        }
+        pendingAnswers = [];
         
-        if (data.action === 'next_word') {
-            currentIndex = data.index;
-            displayWord();
-        } else if (data.action === 'next_set') {
+        if (data.accuracy !== undefined) {
+            document.getElementById('accuracyStats').textContent = `정확도: ${data.accuracy}%`;
+        }
+        
+        if (data.action === 'next_set') {
             currentSet = data.current_set;
+            pendingAnswers = [];
+            prefetchGroupAudio(currentSet);
             currentIndex = 0;
             
             // currentGroupIndex와 totalGroups 업데이트
@@ -219,6 +276,8 @@ async function nextWord() {
             // 틀린 단어만 반복
             alert(data.message);
             currentSet = data.current_set;
+            pendingAnswers = [];
+            prefetchGroupAudio(currentSet);
             currentIndex = 0;
             displayWord();
             updateStats();
@@ -230,25 +289,29 @@ async function nextWord() {
             const enterReview = confirm(data.message + '\n\n확인: 복습 시작\n취소: 다음 단어로');
             if (enterReview) {
                 // 복습 시작 API 호출
-                const reviewResponse = await fetch('/api/start_review', {
+                const reviewResponse = await apiFetch('/api/start_review', {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ session_id: sessionId, mode: currentMode })
                 });
                 const reviewData = await reviewResponse.json();
                 currentSet = reviewData.current_set;
+                pendingAnswers = [];
+                prefetchGroupAudio(currentSet);
                 currentIndex = 0;
                 displayWord();
                 updateStats();
             } else {
                 // 다음 10개 단어로 스킵
-                const skipResponse = await fetch('/api/skip_review', {
+                const skipResponse = await apiFetch('/api/skip_review', {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ session_id: sessionId, mode: currentMode })
                 });
                 const skipData = await skipResponse.json();
                 currentSet = skipData.current_set;
+                pendingAnswers = [];
+                prefetchGroupAudio(currentSet);
                 currentIndex = 0;
                 displayWord();
                 updateStats();
@@ -269,14 +332,28 @@ function prevWord() {
     }
 }
 
-async function playAudio() {
+// 발음 요청 주소 (params 에 형식 추가)
+function audioUrl(path, params) {
+    if (audioFormat) {
+        params.set('format', audioFormat);
+    }
+    return `${path}?${params}`;
+}
+
+async function playAudio(slow = false) {
     const word = currentSet[currentIndex];
     if (!word || !word.word) {
         console.error('단어 데이터가 없습니다.');
         return;
     }
     try {
-        const audio = new Audio(`/api/play-audio?word=${encodeURIComponent(word.word)}`);
+        // 묶음 음성을 미리 받아 두었으면 요청 없이 바로 재생 (느린 발음은 따로 요청)
+        const params = new URLSearchParams({ word: word.word });
+        if (slow) {
+            params.set('slow', '1');
+        }
+        const src = (!slow && groupAudio[word.word.trim()]) || audioUrl('/api/play-audio', params);
+        const audio = new Audio(src);
         audio.play();
     } catch (error) {
         console.error('음성 재생 실패:', error);
@@ -284,6 +361,38 @@ async function playAudio() {
     }
 }
 
+// 묶음의 발음을 한 번에 받아서 단어별 Blob URL 로 나눠 둠
+async function prefetchGroupAudio(words) {
+    Object.values(groupAudio).forEach(url => URL.revokeObjectURL(url));
+    groupAudio = {};
+    const params = new URLSearchParams();
+    (words || []).forEach(w => { if (w && w.word) params.append('w', w.word.trim()); });
+    if (!params.toString()) {
+        return;
+    }
+    try {
+        const response = await apiFetch(audioUrl('/api/audio-bundle', params));
+        if (!response.ok) {
+            return;
+        }
+        const manifest = JSON.parse(response.headers.get('X-Audio-Manifest') || '[]');
+        const type = response.headers.get('Content-Type') || 'audio/mpeg';
+        const buffer = await response.arrayBuffer();
+        const audio = {};
+        manifest.forEach(([word, offset, length]) => {
+            audio[word] = URL.createObjectURL(new Blob([buffer.slice(offset, offset + length)], { type }));
+        });
+        // 받는 동안 다른 묶음으로 넘어갔으면 버림
+        if (currentSet !== words) {
+            Object.values(audio).forEach(url => URL.revokeObjectURL(url));
+            return;
+        }
+        groupAudio = audio;
+    } catch (error) {
+        console.error('묶음 음성 미리 받기 실패:', error);
+    }
+}
+
 function googleTranslate() {
     const word = currentSet[currentIndex];
     if (!word || !word.word) {
@@ -294,6 +403,14 @@ function googleTranslate() {
     window.open(translateUrl, '_blank');
 }
 
+function playExampleAudio() {
+    const word = currentSet[currentIndex];
+    if (!word || !word.example) {
+        return;
+    }
+    new Audio(audioUrl('/api/play-audio', new URLSearchParams({ text: word.example }))).play();
+}
+
 function showHint() {
     const word = currentSet[currentIndex];
     const hintText = `[예문]\n${word.example || '없음'}\n\n[첫 글자]\n${word.word[0]}...`;
@@ -322,7 +439,7 @@ function showSetCompleteDialog() {
 async function loadWordsSheet() {
     console.log('loadWordsSheet 호출됨');
     try {
-        const response = await fetch('/api/load-words-sheet', {
+        const response = await apiFetch('/api/load-words-sheet', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ session_id: sessionId })
@@ -330,6 +447,8 @@ async function loadWordsSheet() {
         
         const data = await response.json();
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         currentMode = 'Words';
         
@@ -381,7 +500,7 @@ async function loadWordsSheet() {
 async function loadEdSheet() {
     console.log('loadEdSheet 호출됨');
     try {
-        const response = await fetch('/api/load-ed-sheet', {
+        const response = await apiFetch('/api/load-ed-sheet', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ session_id: sessionId })
@@ -391,6 +510,8 @@ async function loadEdSheet() {
         console.log('loadEdSheet response:', data);
         
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         currentMode = 'ed';
         
@@ -444,7 +565,7 @@ async function loadEdSheet() {
 async function loadYbSheet() {
     console.log('loadYbSheet 호출됨');
     try {
-        const response = await fetch('/api/load-yb-sheet', {
+        const response = await apiFetch('/api/load-yb-sheet', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ session_id: sessionId })
@@ -452,6 +573,8 @@ async function loadYbSheet() {
         
         const data = await response.json();
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         currentMode = 'yb';
         
@@ -503,7 +626,7 @@ async function loadYbSheet() {
 async function loadNumbersSheet() {
     console.log('loadNumbersSheet 호출됨');
     try {
-        const response = await fetch('/api/load-numbers-sheet', {
+        const response = await apiFetch('/api/load-numbers-sheet', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ session_id: sessionId })
@@ -511,6 +634,8 @@ async function loadNumbersSheet() {
         
         const data = await response.json();
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         currentMode = 'numbers';
         
@@ -562,7 +687,7 @@ async function loadNumbersSheet() {
 async function nextNineWords() {
     try {
         const category = document.getElementById('categorySelect').value;
-        const response = await fetch('/api/next-nine-words', {
+        const response = await apiFetch('/api/next-nine-words', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
@@ -580,6 +705,8 @@ async function nextNineWords() {
         }
         
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         
         // currentGroupIndex 업데이트
@@ -615,7 +742,7 @@ async function nextNineWords() {
 
 async function repeatNineWords() {
     try {
-        const response = await fetch('/api/repeat-nine-words', {
+        const response = await apiFetch('/api/repeat-nine-words', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ session_id: sessionId })
@@ -623,6 +750,8 @@ async function repeatNineWords() {
         
         const data = await response.json();
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         displayWord();
     } catch (error) {
@@ -642,17 +771,18 @@ function addWordDialog() {
 
 async function addWord(word, meaning) {
     try {
-        const response = await fetch('/api/add-word', {
+        const response = await apiFetch('/api/add-word', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
                 word: word,
-                meaning: meaning
+                meaning: meaning,
+                mode: currentMode
             })
         });
         
         const data = await response.json();
-        alert(data.message || '단어가 추가되었습니다.');
+        alert(data.message || data.error || '단어가 추가되었습니다.');
     } catch (error) {
         console.error('단어 추가 실패:', error);
         alert('단어 추가에 실패했습니다.');
@@ -670,14 +800,14 @@ function deleteWordDialog() {
 
 async function deleteWord(word) {
     try {
-        const response = await fetch('/api/delete-word', {
+        const response = await apiFetch('/api/delete-word', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ word: word })
+            body: JSON.stringify({ word: word, mode: currentMode })
         });
         
         const data = await response.json();
-        alert(data.message || '단어가 삭제되었습니다.');
+        alert(data.message || data.error || '단어가 삭제되었습니다.');
         nextWord();
     } catch (error) {
         console.error('단어 삭제 실패:', error);
@@ -725,10 +855,12 @@ async function loadAiTab() {
         document.querySelector('.button-section').style.display = 'none';
         document.querySelector('.result-message').style.display = 'none';
         
-        // Words 단어 로드
-        const response = await fetch('/api/init');
+        // Words 단어 로드 (기존 세션 ID를 재사용해 서버에 세션이 쌓이지 않도록 함)
+        const response = await apiFetch(`/api/init?session_id=${encodeURIComponent(sessionId)}`);
         const data = await response.json();
         currentSet = data.current_set;
+        pendingAnswers = [];
+        prefetchGroupAudio(currentSet);
         currentIndex = 0;
         currentMode = 'ai';
         
@@ -757,7 +889,7 @@ async function generateAiSentences() {
     sentencesDiv.textContent = '🤖 AI가 예문을 생성하고 있습니다...';
     
     try {
-        const response = await fetch('/api/ai-generate-sentences', {
+        const response = await apiFetch('/api/ai-generate-sentences', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ word: word.word })
@@ -788,7 +920,7 @@ async function checkUserSentence() {
     feedbackDiv.textContent = '🤖 AI가 평가하고 있습니다...';
     
     try {
-        const response = await fetch('/api/ai-check-sentence', {
+        const response = await apiFetch('/api/ai-check-sentence', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ 
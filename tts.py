@@ -0,0 +1,88 @@
+"""발음 음성 합성기 (gTTS, espeak-ng, 테스트용 stub)
+
+합성기는 모두 같은 모양이다.
+
+    synthesizer.voice      캐시 키에 들어가는 음성 이름 (합성기가 다르면 다른 파일)
+    synthesizer.fmt        파일 형식 (확장자)
+    synthesizer.mimetype   응답 Content-Type
+    synthesizer.synthesize(text, lang='en', slow=False) -> bytes
+
+gTTS 는 네트워크가 필요하고, espeak-ng 는 로컬에서 WAV 를 만들며, stub 은 입력마다
+항상 같은 바이트를 돌려줘서 네트워크 없이 캐시/사전 생성을 확인할 때 쓴다.
+"""
+import hashlib
+import io
+import shutil
+import subprocess
+
+try:
+    from gtts import gTTS
+except ImportError:  # gTTS 없이도 espeak-ng/stub 은 사용 가능
+    gTTS = None
+
+
+class GTTSSynthesizer:
+    """Google 번역 TTS (네트워크 필요)"""
+
+    # 합성기를 고르기 전에 만든 캐시 파일을 그대로 쓰도록 빈 이름 유지
+    voice = ''
+    fmt = 'mp3'
+    mimetype = 'audio/mpeg'
+
+    def synthesize(self, text, lang='en', slow=False):
+        if gTTS is None:
+            raise RuntimeError('gTTS 패키지가 설치되어 있지 않습니다.')
+        audio_fp = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=slow).write_to_fp(audio_fp)
+        return audio_fp.getvalue()
+
+
+class EspeakSynthesizer:
+    """espeak-ng 로컬 합성 (오프라인, WAV)"""
+
+    fmt = 'wav'
+    mimetype = 'audio/wav'
+
+    def __init__(self, executable=None, speed=160, slow_speed=110, timeout=30):
+        self.executable = executable or shutil.which('espeak-ng') or shutil.which('espeak')
+        if self.executable is None:
+            raise RuntimeError('espeak-ng 를 찾을 수 없습니다.')
+        self.voice = 'espeak-ng'
+        self.speed = speed
+        self.slow_speed = slow_speed
+        self.timeout = timeout
+
+    def synthesize(self, text, lang='en', slow=False):
+        speed = self.slow_speed if slow else self.speed
+        # 텍스트는 명령행 인자가 아니라 stdin 으로 넘김 ('-f파일' 같은 텍스트가 옵션으로 해석되지 않게)
+        result = subprocess.run([self.executable, '--stdout', '--stdin', '-v', lang, '-s', str(speed)],
+                                input=text.encode('utf-8'), capture_output=True, check=True,
+                                timeout=self.timeout)
+        return result.stdout
+
+
+class StubSynthesizer:
+    """입력의 해시로 만든 고정 바이트 (네트워크/엔진 없이 테스트용)"""
+
+    voice = 'stub'
+    fmt = 'mp3'
+    mimetype = 'audio/mpeg'
+
+    def synthesize(self, text, lang='en', slow=False):
+        digest = hashlib.sha256(f'{text}\0{lang}\0{int(bool(slow))}'.encode('utf-8')).digest()
+        return b'ID3STUB' + digest * 8
+
+
+SYNTHESIZERS = {
+    'gtts': GTTSSynthesizer,
+    'espeak': EspeakSynthesizer,
+    'stub': StubSynthesizer,
+}
+
+
+def get_synthesizer(name):
+    """이름으로 합성기 생성 (gtts, espeak, stub)"""
+    try:
+        return SYNTHESIZERS[name]()
+    except KeyError:
+        raise ValueError(f'알 수 없는 TTS 합성기입니다: {name}') from None
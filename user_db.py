@@ -0,0 +1,138 @@
+"""SQLite 기반 사용자/진행 상황 저장소
+
+users.json 은 전체 사용자를 하나의 문서로 읽고 쓰기 때문에 사용자 수가 늘수록
+로그인/정답 저장 비용이 커진다. 여기서는 사용자 1명 = 1행, (사용자, 모드) 진행 상황
+1개 = 1행으로 저장하고 WAL 모드로 동시 읽기/쓰기를 허용한다.
+
+사용법 (users.json 가져오기):
+    python user_db.py import [users.json] [users.db]
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    username TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (username, mode)
+);
+"""
+
+# 모든 쿼리는 고정 문자열이라 sqlite3 의 연결별 statement 캐시에서 재사용된다
+SQL_GET_PASSWORD = "SELECT password FROM users WHERE username = ?"
+SQL_UPSERT_USER = ("INSERT INTO users (username, password) VALUES (?, ?) "
+                   "ON CONFLICT(username) DO UPDATE SET password = excluded.password")
+SQL_GET_PROGRESS = "SELECT data FROM progress WHERE username = ? AND mode = ?"
+SQL_UPSERT_PROGRESS = ("INSERT INTO progress (username, mode, data) VALUES (?, ?, ?) "
+                       "ON CONFLICT(username, mode) DO UPDATE SET data = excluded.data")
+SQL_COUNT_USERS = "SELECT COUNT(*) FROM users"
+
+
+class SQLiteUserStore:
+    """사용자와 진행 상황을 SQLite(WAL)에 저장하는 저장소 (스레드별 연결 사용)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self):
+        """현재 스레드 전용 연결 반환 (없으면 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, cached_statements=64)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def user_count(self):
+        return self._conn().execute(SQL_COUNT_USERS).fetchone()[0]
+
+    def get_password(self, username):
+        """비밀번호 조회 (없는 사용자면 None)"""
+        row = self._conn().execute(SQL_GET_PASSWORD, (username,)).fetchone()
+        return row[0] if row else None
+
+    def add_user(self, username, password):
+        conn = self._conn()
+        with conn:
+            conn.execute(SQL_UPSERT_USER, (username, password))
+
+    def get_progress(self, username, mode):
+        """(사용자, 모드) 진행 상황 조회 (없으면 None)"""
+        row = self._conn().execute(SQL_GET_PROGRESS, (username, mode)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_mode_progress(self, username, mode):
+        """(사용자, 모드) 진행 상황 조회 (기록이 없으면 {}, 없는 사용자면 None)"""
+        progress = self.get_progress(username, mode)
+        if progress is not None:
+            return progress
+        return {} if self.get_password(username) is not None else None
+
+    def save_progress(self, username, mode, progress_data):
+        conn = self._conn()
+        with conn:
+            conn.execute(SQL_UPSERT_PROGRESS,
+                         (username, mode, json.dumps(progress_data, ensure_ascii=False)))
+
+    def save_progress_records(self, records):
+        """{username: {mode: progress}} 변경분을 한 트랜잭션으로 저장 (주어진 모드 행만 갱신)"""
+        rows = [(username, mode, json.dumps(data, ensure_ascii=False))
+                for username, modes in records.items()
+                for mode, data in modes.items()]
+        conn = self._conn()
+        with conn:
+            conn.executemany(SQL_UPSERT_PROGRESS, rows)
+
+    def import_users(self, users):
+        """users.json 형식의 dict 가져오기 (기존 {'username': 'password'} 형식도 지원)"""
+        user_rows = []
+        progress_rows = []
+        for username, user_data in users.items():
+            if isinstance(user_data, str):
+                # 기존: {'username': 'password'}
+                user_rows.append((username, user_data))
+                continue
+            user_rows.append((username, user_data.get('password', '')))
+            for mode, data in user_data.get('progress', {}).items():
+                progress_rows.append((username, mode, json.dumps(data, ensure_ascii=False)))
+        conn = self._conn()
+        with conn:
+            conn.executemany(SQL_UPSERT_USER, user_rows)
+            conn.executemany(SQL_UPSERT_PROGRESS, progress_rows)
+        return len(user_rows)
+
+    def import_users_json(self, users_file):
+        """users.json 파일을 한 번에 가져오기"""
+        with open(users_file, 'r', encoding='utf-8') as f:
+            return self.import_users(json.load(f))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'import':
+        print(__doc__)
+        sys.exit(1)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    users_file = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, 'users.json')
+    db_file = sys.argv[3] if len(sys.argv) > 3 else os.path.join(base_dir, 'users.db')
+    store = SQLiteUserStore(db_file)
+    count = store.import_users_json(users_file)
+    print(f"{count}명의 사용자를 {db_file} 로 가져왔습니다.")
@@ -0,0 +1,190 @@
+"""사용자별 개인 단어장 (공유 코퍼스 위에 얹는 copy-on-write 오버레이)
+
+사용자가 추가/삭제한 단어는 공유 코퍼스 파일이 아니라 (사용자, 모드) 1행짜리 작은
+레코드에만 기록한다.
+
+    {"added": [{"word": "Zebra", "meaning": "얼룩말", ...}], "hidden": ["apple"]}
+
+묶음을 만들 때 공유 스냅샷 위에 추가한 단어를 뒤에 붙이고 숨긴 단어를 빼서 개인
+스냅샷을 만든다. 공유 스냅샷과 그 캐시(묶음 배치, 직렬화된 묶음)는 그대로이고, 다른
+사용자의 묶음도 바뀌지 않는다.
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    username TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    data TEXT NOT NULL,
+    rev INTEGER NOT NULL,
+    PRIMARY KEY (username, mode)
+);
+"""
+
+SQL_GET = "SELECT rev, data FROM decks WHERE username = ? AND mode = ?"
+SQL_UPSERT = ("INSERT INTO decks (username, mode, data, rev) VALUES (?, ?, ?, ?) "
+              "ON CONFLICT(username, mode) DO UPDATE SET data = excluded.data, rev = excluded.rev")
+SQL_STATS = "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM decks"
+
+
+class DeckStore:
+    """(사용자, 모드) → 개인 단어장 레코드 (SQLite WAL, 스레드별 연결)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self):
+        """현재 스레드 전용 연결 반환 (없으면 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, cached_statements=64,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, username, mode):
+        """(rev, 단어장) 반환 (없으면 None)"""
+        row = self._conn().execute(SQL_GET, (username, mode)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def update(self, username, mode, edit):
+        """단어장을 읽어 edit(deck) 으로 고친 뒤 저장 (edit 의 반환값 반환)
+
+        BEGIN IMMEDIATE 로 읽기부터 쓰기 잠금을 잡으므로 다른 워커의 수정과 섞이지 않는다.
+        edit 이 False/None 을 반환하면 저장하지 않는다.
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(SQL_GET, (username, mode)).fetchone()
+            rev, deck = (row[0], json.loads(row[1])) if row else (0, {'added': [], 'hidden': []})
+            result = edit(deck)
+            if result:
+                conn.execute(SQL_UPSERT, (username, mode,
+                                          json.dumps(deck, ensure_ascii=False), rev + 1))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return result
+
+    def stats(self):
+        decks, size = self._conn().execute(SQL_STATS).fetchone()
+        return {'decks': decks, 'bytes': size}
+
+
+class PersonalCorpora:
+    """사용자별 코퍼스 스냅샷 (단어장이 없으면 공유 스냅샷을 그대로 반환)
+
+    개인 스냅샷 버전은 "공유 버전~단어장 rev" 이고, 세션이 예전 버전의 단어 ID 를 쓸 수
+    있도록 최근 스냅샷을 (사용자, 모드, 버전) 키로 max_entries 개까지 보관한다.
+    """
+
+    def __init__(self, registry, store, max_entries=2000):
+        self._registry = registry
+        self._store = store
+        self.max_entries = max_entries
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+        self.built_count = 0
+
+    def get(self, username, mode):
+        """사용자가 보는 최신 스냅샷"""
+        base = self._registry.get(mode)
+        record = self._store.get(username, mode) if username else None
+        if record is None:
+            return base
+        rev, deck = record
+        key = (username, mode, f'{base.version}~{rev}')
+        with self._lock:
+            corpus = self._snapshots.get(key)
+            if corpus is not None:
+                self._snapshots.move_to_end(key)
+                return corpus
+        corpus = self._build(base, deck, key[2])
+        with self._lock:
+            self._snapshots[key] = corpus
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+        return corpus
+
+    def _build(self, base, deck, version):
+        # 공유 코퍼스에 나중에 같은 단어가 생겼으면 개인 단어는 건너뜀
+        added = [w for w in deck.get('added', ()) if not base.ids_of(w['word'])]
+        hidden = frozenset(i for word in deck.get('hidden', ()) for i in base.ids_of(word))
+        if not added and not hidden:
+            return base
+        self.built_count += 1
+        return base.with_edits(added, len(added), base.deleted | hidden, version, personal=True)
+
+    def snapshot(self, username, mode, version):
+        """특정 버전의 스냅샷 (이미 버려졌으면 None)"""
+        corpus = self.get(username, mode)
+        if corpus.version == version:
+            return corpus
+        with self._lock:
+            corpus = self._snapshots.get((username, mode, version))
+        return corpus or self._registry.snapshot(mode, version)
+
+    def add_word(self, username, mode, word):
+        """개인 단어장에 단어 추가 (추가된 단어 ID 반환, 이미 보이는 단어면 None)"""
+        key = word['word'].casefold()
+        base = self._registry.get(mode)
+
+        def edit(deck):
+            if any(w['word'].casefold() == key for w in deck['added']):
+                return False
+            if key in deck['hidden']:
+                # 숨겼던 공유 단어를 다시 보이게 함
+                deck['hidden'].remove(key)
+                return True
+            if base.ids_of(key):
+                return False
+            deck['added'].append(word)
+            return True
+
+        if not self._store.update(username, mode, edit):
+            return None
+        ids = self.get(username, mode).ids_of(key)
+        return ids[0] if ids else None
+
+    def delete_word(self, username, mode, word):
+        """개인 단어장에서 단어 삭제 (공유 단어는 이 사용자에게만 숨김, 삭제했으면 True)"""
+        key = word.casefold()
+        base = self._registry.get(mode)
+
+        def edit(deck):
+            added = [w for w in deck['added'] if w['word'].casefold() != key]
+            if len(added) != len(deck['added']):
+                deck['added'] = added
+                return True
+            if key in deck['hidden'] or not base.ids_of(key):
+                return False
+            deck['hidden'].append(key)
+            return True
+
+        return self._store.update(username, mode, edit)
+
+    def deck(self, username, mode):
+        """사용자의 단어장 레코드 (없으면 빈 단어장)"""
+        record = self._store.get(username, mode)
+        deck = record[1] if record else {}
+        return {'added': deck.get('added', []), 'hidden': deck.get('hidden', []),
+                'rev': record[0] if record else 0}
+
+    def stats(self):
+        stats = self._store.stats()
+        stats['snapshots'] = len(self._snapshots)
+        stats['built'] = self.built_count
+        return stats